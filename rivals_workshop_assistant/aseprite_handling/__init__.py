@@ -1,11 +1,12 @@
 import itertools
-import os
-import subprocess
+import typing
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Tuple
 
 from rivals_workshop_assistant import paths, assistant_config_mod
+from rivals_workshop_assistant.assistant_config_mod import ExportBackend
 from ._aseprite_loading import RawAsepriteFile
 from .constants import (
     ANIMS_WHICH_CARE_ABOUT_SMALL_SPRITES,
@@ -13,10 +14,18 @@ from .constants import (
     HURTBOX_LAYER_NAME,
     ANIMS_WHICH_GET_HURTBOXES,
 )
-from ..file_handling import File, _get_modified_time
+from ..file_handling import File, _get_is_fresh, _get_modified_time
 from ..dotfile_mod import get_processed_time
-from .types import AsepriteTag, TagColor
-from ..paths import ASEPRITE_LUA_SCRIPTS_PATH
+from ..file_states import FileStates
+from .exporting import (
+    ExportJob,
+    export_with_aseprite,
+    ANIM_EXPORT,
+    HURTBOX_EXPORT,
+)
+from .metadata_cache import AsepriteMetadataCache
+from .export_cache import ExportCache, get_job_fingerprint
+from .types import AsepriteTag, TagColor, from_json_color, to_json_color
 from ..script_mod import Script
 
 
@@ -73,67 +82,60 @@ class Anim(TagObject):
         aseprite_file_path: Path,
         has_small_sprites: bool,
         hurtboxes_enabled: bool,
+        export_backend: ExportBackend = ExportBackend.ASEPRITE,
     ):
-        root_name = get_anim_file_name_root(root_dir, aseprite_file_path, self.name)
-        if has_small_sprites and self._cares_about_small_sprites():
-            scale_param = 1
-        else:
-            scale_param = 2
-        self._run_lua_export(
-            root_dir=root_dir,
-            aseprite_file_path=aseprite_file_path,
+        run_export_jobs(
             aseprite_path=aseprite_path,
-            base_name=root_name,
-            script_name="export_aseprite.lua",
-            lua_params={"scale": scale_param},
-        )
-
-        if hurtboxes_enabled and self._gets_a_hurtbox():
-            self._run_lua_export(
+            aseprite_file_path=aseprite_file_path,
+            export_backend=export_backend,
+            jobs=self.get_export_jobs(
                 root_dir=root_dir,
                 aseprite_file_path=aseprite_file_path,
-                aseprite_path=aseprite_path,
-                base_name=f"{root_name}_hurt",
-                script_name="create_hurtbox.lua",
-            )
+                has_small_sprites=has_small_sprites,
+                hurtboxes_enabled=hurtboxes_enabled,
+            ),
+        )
 
-    def _run_lua_export(
+    def get_export_jobs(
         self,
         root_dir: Path,
         aseprite_file_path: Path,
-        aseprite_path: Path,
-        base_name: str,
-        script_name: str,
-        lua_params: dict = None,
-    ):
-        if lua_params is None:
-            lua_params = {}
+        has_small_sprites: bool,
+        hurtboxes_enabled: bool,
+    ) -> List[ExportJob]:
+        """Get the strips to export for the anim."""
+        root_name = get_anim_file_name_root(root_dir, aseprite_file_path, self.name)
+        if has_small_sprites and self._cares_about_small_sprites():
+            scale_param = 1
+        else:
+            scale_param = 2
+        jobs = [
+            ExportJob(
+                kind=ANIM_EXPORT,
+                start=self.start,
+                end=self.end,
+                scale=scale_param,
+                dest=self._get_dest(root_dir=root_dir, base_name=root_name),
+            )
+        ]
 
-        _delete_paths_from_glob(
-            root_dir,
-            f"{base_name}" + "_strip*.png",
-        )
+        if hurtboxes_enabled and self._gets_a_hurtbox():
+            jobs.append(
+                ExportJob(
+                    kind=HURTBOX_EXPORT,
+                    start=self.start,
+                    end=self.end,
+                    scale=2,
+                    dest=self._get_dest(
+                        root_dir=root_dir, base_name=f"{root_name}_hurt"
+                    ),
+                )
+            )
+        return jobs
 
+    def _get_dest(self, root_dir: Path, base_name: str) -> Path:
         dest_name = f"{base_name}" + f"_strip{self.num_frames}.png"
-        dest = root_dir / paths.SPRITES_FOLDER / dest_name
-        dest.parent.mkdir(parents=True, exist_ok=True)
-
-        command_parts = (
-            [
-                f'"{aseprite_path}"',
-                "-b",
-                f"-script-param filename={aseprite_file_path}",
-                f"-script-param dest={dest}",
-                f"-script-param startFrame={self.start + 1}",
-                f"-script-param endFrame={self.end + 1}",
-            ]
-            + [f"-script-param {key}={value}" for key, value in lua_params.items()]
-            + [
-                f"-script {ASEPRITE_LUA_SCRIPTS_PATH / script_name}",
-            ]
-        )
-        export_command = " ".join(command_parts)
-        subprocess.run(export_command)
+        return root_dir / paths.SPRITES_FOLDER / dest_name
 
     def _cares_about_small_sprites(self):
         return self.name in ANIMS_WHICH_CARE_ABOUT_SMALL_SPRITES
@@ -142,11 +144,39 @@ class Anim(TagObject):
         return self.name in ANIMS_WHICH_GET_HURTBOXES
 
 
-def _delete_paths_from_glob(root_dir: Path, paths_glob: str):
-    """Delete paths matching the glob"""
-    old_paths = (root_dir / paths.SPRITES_FOLDER).glob(paths_glob)
-    for old_path in old_paths:
-        os.remove(old_path)
+def run_export_jobs(
+    aseprite_path: typing.Optional[Path],
+    aseprite_file_path: Path,
+    jobs: List[ExportJob],
+    export_backend: ExportBackend = ExportBackend.ASEPRITE,
+    raw: RawAsepriteFile = None,
+) -> List[ExportJob]:
+    """Hurtboxes are always made in python, and so are anim strips with the native
+    backend. Otherwise anim strips need Aseprite, so they're skipped when there's
+    no aseprite_path.
+    Returns the jobs that were run."""
+    # Imported here since Pillow is slow to import, and most runs don't export.
+    from .native_export import export_natively
+
+    if export_backend == ExportBackend.NATIVE:
+        native_jobs = jobs
+        aseprite_jobs = []
+    else:
+        native_jobs = [job for job in jobs if job.kind == HURTBOX_EXPORT]
+        if aseprite_path:
+            aseprite_jobs = [job for job in jobs if job.kind == ANIM_EXPORT]
+        else:
+            aseprite_jobs = []
+
+    for job in native_jobs + aseprite_jobs:
+        job.prepare()
+    export_natively(aseprite_file_path=aseprite_file_path, jobs=native_jobs, raw=raw)
+    export_with_aseprite(
+        aseprite_path=aseprite_path,
+        aseprite_file_path=aseprite_file_path,
+        jobs=aseprite_jobs,
+    )
+    return native_jobs + aseprite_jobs
 
 
 def get_anim_file_name_root(root_dir: Path, aseprite_file_path: Path, name: str) -> str:
@@ -172,6 +202,7 @@ class AsepriteData:
         window_tag_color: TagColor,
         tags: List[AsepriteTag] = None,
         is_fresh: bool = False,
+        anims: List[Anim] = None,
     ):
         self.num_frames = num_frames
         if tags is None:
@@ -181,7 +212,9 @@ class AsepriteData:
         self.window_tag_color = window_tag_color
         self.is_fresh = is_fresh
 
-        self.anims = self.get_anims(name)
+        if anims is None:
+            anims = self.get_anims(name)
+        self.anims = anims
 
     @classmethod
     def from_path(
@@ -192,9 +225,7 @@ class AsepriteData:
         window_tag_color: TagColor,
         is_fresh: bool,
     ):
-        with open(path, "rb") as f:
-            contents = f.read()
-            raw_aseprite_file = RawAsepriteFile(contents)
+        raw_aseprite_file = RawAsepriteFile.from_path(path, metadata_only=True)
         tags = raw_aseprite_file.get_tags()
         num_frames = raw_aseprite_file.get_num_frames()
         return cls(
@@ -206,6 +237,66 @@ class AsepriteData:
             is_fresh=is_fresh,
         )
 
+    @classmethod
+    def from_cache_data(
+        cls,
+        name: str,
+        data: dict,
+        anim_tag_color: TagColor,
+        window_tag_color: TagColor,
+        is_fresh: bool,
+    ):
+        """Rebuild from to_cache_data, without deriving the anims again."""
+        tags = [
+            AsepriteTag(
+                name=tag_name, start=start, end=end, color=from_json_color(color)
+            )
+            for tag_name, start, end, color in data["tags"]
+        ]
+        anims = [
+            Anim(
+                name=anim_data["name"],
+                start=anim_data["start"],
+                end=anim_data["end"],
+                windows=[
+                    Window(name=window_name, start=start, end=end)
+                    for window_name, start, end in anim_data["windows"]
+                ],
+                is_fresh=is_fresh,
+            )
+            for anim_data in data["anims"]
+        ]
+        return cls(
+            name=name,
+            tags=tags,
+            num_frames=data["num_frames"],
+            anim_tag_color=anim_tag_color,
+            window_tag_color=window_tag_color,
+            is_fresh=is_fresh,
+            anims=anims,
+        )
+
+    def to_cache_data(self) -> dict:
+        return {
+            "num_frames": self.num_frames,
+            "tags": [
+                [tag.name, tag.start, tag.end, to_json_color(tag.color)]
+                for tag in self.tags
+            ],
+            "anims": [
+                {
+                    "name": anim.name,
+                    "start": anim.start,
+                    "end": anim.end,
+                    "windows": [
+                        [window.name, window.start, window.end]
+                        for window in anim.windows
+                    ],
+                }
+                for anim in self.anims
+            ],
+        }
+
     def get_anims(self, name: str):
         tag_anims = [
             self.make_anim(
@@ -256,14 +347,19 @@ class Aseprite(File):
         modified_time: datetime = None,
         processed_time: datetime = None,
         content=None,
+        metadata_cache: AsepriteMetadataCache = None,
+        is_fresh: bool = None,
     ):
-        super().__init__(path, modified_time, processed_time)
+        super().__init__(path, modified_time, processed_time, is_fresh)
         self.anim_tag_color = anim_tag_color
         self.window_tag_color = window_tag_color
         self._content = content
+        self.metadata_cache = metadata_cache
 
     @property
     def content(self) -> AsepriteData:
+        if self._content is None:
+            self._content = self._read_cached_content()
         if self._content is None:
             self._content = AsepriteData.from_path(
                 name=self.path.stem,
@@ -272,8 +368,24 @@ class Aseprite(File):
                 window_tag_color=self.window_tag_color,
                 is_fresh=self.is_fresh,
             )
+            if self.metadata_cache is not None:
+                self.metadata_cache.store(self.path, self._content.to_cache_data())
         return self._content
 
+    def _read_cached_content(self) -> typing.Optional[AsepriteData]:
+        if self.metadata_cache is None:
+            return None
+        data = self.metadata_cache.get(self.path)
+        if data is None:
+            return None
+        return AsepriteData.from_cache_data(
+            name=self.path.stem,
+            data=data,
+            anim_tag_color=self.anim_tag_color,
+            window_tag_color=self.window_tag_color,
+            is_fresh=self.is_fresh,
+        )
+
     @property
     def name(self):
         return self.path.stem
@@ -284,19 +396,63 @@ class Aseprite(File):
         aseprite_path: Path,
         has_small_sprites: bool = False,
         hurtboxes_enabled=False,
-    ):
-        for anim in self.content.anims:
-            anim.save(
-                root_dir=root_dir,
+        export_backend: ExportBackend = ExportBackend.ASEPRITE,
+        export_cache: ExportCache = None,
+    ) -> List[ExportJob]:
+        """Export all anims in the file, reading the file only once.
+        If there's an export cache, strips whose frames and params haven't changed
+        since they were last exported are skipped.
+        Returns the jobs that were run."""
+        jobs = list(
+            itertools.chain(
+                *[
+                    anim.get_export_jobs(
+                        root_dir=root_dir,
+                        aseprite_file_path=self.path,
+                        has_small_sprites=has_small_sprites,
+                        hurtboxes_enabled=hurtboxes_enabled,
+                    )
+                    for anim in self.content.anims
+                ]
+            )
+        )
+        if export_cache is None:
+            return run_export_jobs(
                 aseprite_path=aseprite_path,
                 aseprite_file_path=self.path,
-                has_small_sprites=has_small_sprites,
-                hurtboxes_enabled=hurtboxes_enabled,
+                jobs=jobs,
+                export_backend=export_backend,
             )
 
+        with RawAsepriteFile.from_path(self.path) as raw:
+            fingerprints = [
+                get_job_fingerprint(raw=raw, job=job, export_backend=export_backend)
+                for job in jobs
+            ]
+            jobs_to_run = [
+                job
+                for job, fingerprint in zip(jobs, fingerprints)
+                if not export_cache.is_up_to_date(root_dir, job, fingerprint)
+            ]
+            ran_jobs = run_export_jobs(
+                aseprite_path=aseprite_path,
+                aseprite_file_path=self.path,
+                jobs=jobs_to_run,
+                export_backend=export_backend,
+                raw=raw,
+            )
+        for job, fingerprint in zip(jobs, fingerprints):
+            if job in ran_jobs:
+                export_cache.store(root_dir, job, fingerprint)
+        return ran_jobs
+
 
 def read_aseprites(
-    root_dir: Path, dotfile: dict, assistant_config: dict
+    root_dir: Path,
+    dotfile: dict,
+    assistant_config: dict,
+    metadata_cache: AsepriteMetadataCache = None,
+    file_states: FileStates = None,
 ) -> List[Aseprite]:
     ase_paths = itertools.chain(
         *[
@@ -307,27 +463,64 @@ def read_aseprites(
 
     aseprites = []
     for path in ase_paths:
-        aseprite = read_aseprite(path, dotfile, assistant_config)
+        aseprite = read_aseprite(
+            path, dotfile, assistant_config, metadata_cache, file_states
+        )
         aseprites.append(aseprite)
     return aseprites
 
 
-def read_aseprite(path: Path, dotfile: dict, assistant_config: dict):
+def read_aseprite(
+    path: Path,
+    dotfile: dict,
+    assistant_config: dict,
+    metadata_cache: AsepriteMetadataCache = None,
+    file_states: FileStates = None,
+):
+    """If there are file states, they decide whether the aseprite is fresh."""
+    if file_states is not None:
+        is_fresh = file_states.is_fresh(path)
+    else:
+        is_fresh = _get_is_fresh(
+            get_processed_time(dotfile=dotfile, path=path), _get_modified_time(path)
+        )
     aseprite = Aseprite(
         path=path,
-        modified_time=_get_modified_time(path),
-        processed_time=get_processed_time(dotfile=dotfile, path=path),
+        is_fresh=is_fresh,
         anim_tag_color=assistant_config_mod.get_anim_tag_color(assistant_config),
         window_tag_color=assistant_config_mod.get_window_tag_color(assistant_config),
+        metadata_cache=metadata_cache,
     )
     return aseprite
 
 
-def get_anims(aseprites: List[Aseprite]) -> List[Anim]:
-    return list(itertools.chain(*[aseprite.content.anims for aseprite in aseprites]))
-    # Unfortunately this involves reading every aseprite file...
-    # If we demand that multi-anim files have a name prefix,
-    # we could get away with reading fewer files.
+def get_anims(aseprites: List[Aseprite]) -> Dict[str, Anim]:
+    """Every anim, keyed by name.
+    If several anims have the same name, the first one is kept and a warning is
+    printed, since scripts couldn't tell which one they belong to."""
+    # This involves reading every aseprite file that isn't in the metadata cache.
+    anims = {}
+    anim_paths = {}
+    duplicate_paths = {}
+    for aseprite in aseprites:
+        for anim in aseprite.content.anims:
+            if anim.name in anims:
+                duplicate_paths.setdefault(anim.name, [anim_paths[anim.name]])
+                duplicate_paths[anim.name].append(aseprite.path)
+            else:
+                anims[anim.name] = anim
+                anim_paths[anim.name] = aseprite.path
+    _report_duplicate_anims(duplicate_paths)
+    return anims
+
+
+def _report_duplicate_anims(duplicate_paths: Dict[str, List[Path]]):
+    for name, anim_paths in duplicate_paths.items():
+        path_lines = "\n".join(f"\t{path.name}" for path in anim_paths)
+        print(
+            f"WARN: There are {len(anim_paths)} anims named {name}, "
+            f"only the one from {anim_paths[0].name} is used:\n{path_lines}"
+        )
 
 
 def save_scripts(root_dir: Path, scripts: List[Script]):
@@ -342,14 +535,56 @@ def save_anims(
     aseprites: List[Aseprite],
     has_small_sprites: bool,
     hurtboxes_enabled: bool = False,
-):
-    if not aseprite_path:
-        return
-    for aseprite in aseprites:
-        if aseprite.is_fresh:
-            aseprite.save(
+    max_export_workers: int = assistant_config_mod.MAX_EXPORT_WORKERS_DEFAULT,
+    export_backend: ExportBackend = ExportBackend.ASEPRITE,
+    export_cache: ExportCache = None,
+) -> List[Path]:
+    """Export every anim of the fresh aseprites.
+    Each aseprite file is exported by its own worker, so up to
+    max_export_workers files are exported at the same time.
+    Failures don't stop the other exports, they're reported together at the end.
+    Returns the paths of the exported strips."""
+    if (
+        not aseprite_path
+        and not hurtboxes_enabled
+        and export_backend != ExportBackend.NATIVE
+    ):
+        return []
+    aseprites_to_save = [aseprite for aseprite in aseprites if aseprite.is_fresh]
+
+    with ThreadPoolExecutor(max_workers=max(1, max_export_workers)) as executor:
+        futures = [
+            executor.submit(
+                aseprite.save,
                 root_dir=root_dir,
                 aseprite_path=aseprite_path,
                 has_small_sprites=has_small_sprites,
                 hurtboxes_enabled=hurtboxes_enabled,
+                export_backend=export_backend,
+                export_cache=export_cache,
             )
+            for aseprite in aseprites_to_save
+        ]
+        failures = [
+            (aseprite, future.exception())
+            for aseprite, future in zip(aseprites_to_save, futures)
+            if future.exception() is not None
+        ]
+        exported_paths = [
+            job.dest
+            for future in futures
+            if future.exception() is None
+            for job in future.result()
+        ]
+
+    _report_export_failures(failures)
+    return exported_paths
+
+
+def _report_export_failures(failures: List[Tuple[Aseprite, Exception]]):
+    if not failures:
+        return
+    failure_lines = "\n".join(
+        f"\t{aseprite.path.name}: {error}" for aseprite, error in failures
+    )
+    print(f"WARN: Failed to export {len(failures)} aseprite file(s):\n{failure_lines}")
@@ -1,5 +1,11 @@
 """https://github.com/Eiyeron/py_aseprite"""
 
+import io
+import mmap
+import struct
+import typing
+from pathlib import Path
+
 from .headers import Header, Frame
 from .chunks import (
     Chunk,
@@ -20,10 +26,47 @@ import rivals_workshop_assistant.aseprite_handling.types
 
 
 class RawAsepriteFile:
-    def __init__(self, data):
-        self.header, self.frames = parse_data(data)
+    def __init__(self, data, metadata_only: bool = False):
+        """Data can be bytes, an mmap, or anything else supporting the buffer protocol.
+        It is never copied: cel data is kept as views into it.
+        If metadata_only, only frame 0's chunks are parsed, and cels are skipped.
+        That's enough for tags, layers and the frame count."""
+        self.data = memoryview(data)
+        self._mmap = None
+        self.header, self.frames = parse_data(self.data, metadata_only=metadata_only)
         self.build_layer_tree()
 
+    @classmethod
+    def from_path(cls, path: Path, metadata_only: bool = False):
+        with open(path, "rb") as f:
+            if metadata_only:
+                data = read_metadata_bytes(f)
+            else:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        raw = cls(data, metadata_only=metadata_only)
+        if isinstance(data, mmap.mmap):
+            raw._mmap = data
+        return raw
+
+    def close(self):
+        """Release the cels' views into the data, and unmap the file if it was
+        mapped.
+        Images made from the cels' pixels without copying them must be gone."""
+        for frame in self.frames:
+            for chunk in frame.chunks:
+                if isinstance(chunk, CelChunk):
+                    chunk.release()
+        self.data.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     def build_layer_tree(self):
         # Assuming that layers are stored in chunk #0.
         # Warn me if they're stored in another chunk
@@ -72,7 +115,7 @@ class RawAsepriteFile:
         return tags
 
     def get_num_frames(self):
-        return len(self.frames)
+        return self.header.num_frames
 
 
 RGB_TO_COLOR_NAME = {
@@ -91,19 +134,52 @@ def rgb_to_color_name(r, g, b) -> str:
     return RGB_TO_COLOR_NAME.get((r, g, b), (r, g, b))
 
 
-def parse_data(data):
+# Chunks holding pixel data, which metadata doesn't need.
+PIXEL_CHUNK_TYPES = (0x2005, 0x2006, 0x2016)
+
+CHUNK_HEADER_SIZE = struct.calcsize(Chunk.chunk_format)
+
+
+def read_metadata_bytes(f: typing.BinaryIO) -> bytes:
+    """Read only the header and frame 0, where the layers and tags are stored.
+    Pixel chunks are seeked past instead of read. Only their chunk header is kept,
+    with its size changed to the header's size, so parse_data can still step over
+    them."""
+    data = bytearray(f.read(Header.header_size))
+    head = Header(data)
+    if head.num_frames == 0:
+        return bytes(data)
+    frame_offset = len(data)
+    data += f.read(Frame.frame_size)
+    frame = Frame(data, frame_offset)
+    for _ in range(frame.num_chunks):
+        chunk_offset = len(data)
+        data += f.read(CHUNK_HEADER_SIZE)
+        chunk = Chunk(data, chunk_offset)
+        if chunk.chunk_type in PIXEL_CHUNK_TYPES:
+            f.seek(chunk.chunk_size - CHUNK_HEADER_SIZE, io.SEEK_CUR)
+            struct.pack_into("<I", data, chunk_offset, CHUNK_HEADER_SIZE)
+        else:
+            data += f.read(chunk.chunk_size - CHUNK_HEADER_SIZE)
+    return bytes(data)
+
+
+def parse_data(data, metadata_only: bool = False):
     head = Header(data)
     data_offset = Header.header_size
     frames = []
     layer_index = 0
-    for i in range(head.num_frames):
+    num_frames_to_parse = min(head.num_frames, 1) if metadata_only else head.num_frames
+    for i in range(num_frames_to_parse):
         frame = Frame(data, data_offset)
         frames.append(frame)
         frame.chunks = []
         data_offset += frame.frame_size
         for c in range(frame.num_chunks):
             chunk = Chunk(data, data_offset)
-            if chunk.chunk_type == 0x2004:
+            if metadata_only and chunk.chunk_type in PIXEL_CHUNK_TYPES:
+                pass
+            elif chunk.chunk_type == 0x2004:
                 layer = LayerChunk(data, layer_index, data_offset)
                 if layer.layer_type & 1 == 1:
                     frame.chunks.append(LayerGroupChunk(layer))
@@ -111,7 +187,7 @@ def parse_data(data):
                     frame.chunks.append(layer)
                 layer_index += 1
             elif chunk.chunk_type == 0x2005:
-                frame.chunks.append(CelChunk(data, data_offset))
+                frame.chunks.append(CelChunk(data, data_offset, head.color_depth))
             elif chunk.chunk_type == 0x2006:
                 frame.chunks.append(CelExtraChunk(data, data_offset))
             elif chunk.chunk_type == 0x2016:
@@ -1,4 +1,6 @@
 from struct import Struct
+import array
+import typing
 import zlib
 import math
 
@@ -108,12 +110,19 @@ class LayerGroupChunk(LayerChunk):
         self.children = []
 
 
+# Bytes per pixel for each header color depth.
+# 32 is RGBA, 16 is grayscale and alpha, 8 is a palette index.
+CHANNELS_FOR_COLOR_DEPTH = {32: 4, 16: 2, 8: 1}
+
+
 class CelChunk(Chunk):
     cel_format = "<HhhBH7x"
     cel_type_format = "<HH"
 
-    def __init__(self, data, data_offset=0):
+    def __init__(self, data, data_offset=0, color_depth=32):
         Chunk.__init__(self, data, data_offset)
+        self.color_depth = color_depth
+        self._pixel_bytes = None
         cel_struct = Struct(CelChunk.cel_format)
         (
             self.layer_index,
@@ -124,7 +133,9 @@ class CelChunk(Chunk):
         ) = cel_struct.unpack_from(data, data_offset + 6)
         cel_offset = data_offset + cel_struct.size + 6
         cel_struct = Struct(CelChunk.cel_type_format)
-        if self.cel_type == 0:
+        if self.cel_type in (0, 2):
+            # The data is kept as it's stored in the file, compressed for type 2.
+            # If the file data is a memoryview, this doesn't copy it.
             self.data = {}
             (self.data["width"], self.data["height"]) = cel_struct.unpack_from(
                 data, cel_offset
@@ -134,14 +145,41 @@ class CelChunk(Chunk):
             self.data["data"] = data[start_range:end_range]
         elif self.cel_type == 1:
             self.data = {"link": Struct("<H").unpack_from(data, cel_offset)}
-        elif self.cel_type == 2:
-            self.data = {}
-            (self.data["width"], self.data["height"]) = cel_struct.unpack_from(
-                data, cel_offset
-            )
-            start_range = cel_offset + cel_struct.size
-            end_range = data_offset + self.chunk_size
-            self.data["data"] = zlib.decompress(data[start_range:end_range])
+
+    @property
+    def is_compressed(self) -> bool:
+        return self.cel_type == 2
+
+    def get_pixel_bytes(self):
+        """The cel's raw pixels, decompressed the first time they're asked for."""
+        if self._pixel_bytes is None:
+            if self.is_compressed:
+                self._pixel_bytes = zlib.decompress(self.data["data"])
+            else:
+                self._pixel_bytes = self.data["data"]
+        return self._pixel_bytes
+
+    def release(self):
+        """Release the cel's view into the file data, if it has one."""
+        self._pixel_bytes = None
+        cel_data = getattr(self, "data", {}).get("data", None)
+        if isinstance(cel_data, memoryview):
+            cel_data.release()
+
+    @property
+    def pixel_shape(self) -> typing.Tuple[int, int, int]:
+        """(height, width, channels) of the cel's pixels."""
+        return (
+            self.data["height"],
+            self.data["width"],
+            CHANNELS_FOR_COLOR_DEPTH[self.color_depth],
+        )
+
+    def get_pixel_array(self) -> array.array:
+        """The cel's pixels as a flat array of bytes.
+        It's pixel_shape, (height, width, channels), flattened row by row,
+        so the pixel at (y, x) starts at index (y * width + x) * channels."""
+        return array.array("B", self.get_pixel_bytes())
 
 
 class CelExtraChunk(Chunk):
@@ -174,7 +212,8 @@ class MaskChunk(Chunk):
 
         start_range = name_offset + string_size
         end_range = start_range + math.ceil(self.height * ((self.width + 7) / 8))
-        self.bitmap = data[start_range:start_range:end_range]
+        # Copied, so the mask doesn't keep a view into the file data. Masks are small.
+        self.bitmap = bytes(data[start_range:end_range])
 
 
 class PathChunk(Chunk):
@@ -230,8 +269,8 @@ class PaletteChunk(Chunk):
             (
                 color["flags"],
                 color["red"],
-                color["blue"],
                 color["green"],
+                color["blue"],
                 color["alpha"],
             ) = color_struct.unpack_from(data, color_offset)
             color_offset += color_struct.size
@@ -0,0 +1,78 @@
+-- Exports every strip of one aseprite file, opening the file only once.
+-- app.params["jobs"] is the path of a file with one export per line:
+--   <kind>\t<startFrame>\t<endFrame>\t<scale>\t<dest>
+-- where kind is "anim". Hurtboxes are made in python instead.
+-- Each export works on its own copy of the sprite, so they don't affect each other.
+
+local source = app.open(app.params["filename"])
+
+local function removeLayer(sprite, layer)
+    app.activeSprite = sprite
+    app.range.layers = { layer }
+    app.command.removeLayer()
+end
+
+-- Deletes frames that aren't in the given range.
+local function keepFrameRange(sprite, startFrame, endFrame)
+    local irrelevantFrames = {}
+    for frameIndex, frame in ipairs(sprite.frames) do
+        if frameIndex < startFrame or endFrame < frameIndex then
+            table.insert(irrelevantFrames, frame)
+        end
+    end
+    if #irrelevantFrames > 0 then
+        app.activeSprite = sprite
+        app.range.frames = irrelevantFrames
+        app.command.RemoveFrame()
+    end
+end
+
+local function exportSheet(sprite, dest)
+    app.activeSprite = sprite
+    app.command.ExportSpriteSheet {
+        ui=false,
+        askOverwrite=false,
+        type=SpriteSheetType.HORIZONTAL,
+        textureFilename=dest,
+    }
+end
+
+local function exportAnim(sprite, startFrame, endFrame, scale, dest)
+    local layersToRemove = {}
+    for _, layer in ipairs(sprite.layers) do
+        if layer.name == "HURTMASK" or layer.name == "HURTBOX" then
+            table.insert(layersToRemove, layer)
+        end
+    end
+    for _, layer in ipairs(layersToRemove) do
+        removeLayer(sprite, layer)
+    end
+
+    keepFrameRange(sprite, startFrame, endFrame)
+
+    app.activeSprite = sprite
+    app.command.SpriteSize {
+        scaleX=scale,
+        scaleY=scale,
+    }
+
+    exportSheet(sprite, dest)
+end
+
+local exporters = {
+    anim = exportAnim,
+}
+
+for line in io.lines(app.params["jobs"]) do
+    local kind, startFrame, endFrame, scale, dest = line:match(
+        "^(%a+)\t(%d+)\t(%d+)\t(%d+)\t(.+)$"
+    )
+    if kind ~= nil then
+        local sprite = Sprite(source)
+        app.activeSprite = sprite
+        exporters[kind](sprite, tonumber(startFrame), tonumber(endFrame), tonumber(scale), dest)
+        sprite:close()
+    end
+end
+
+source:close()
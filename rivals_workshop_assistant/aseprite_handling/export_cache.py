@@ -0,0 +1,111 @@
+import hashlib
+from pathlib import Path
+
+from rivals_workshop_assistant import info_files
+from rivals_workshop_assistant.assistant_config_mod import ExportBackend
+from rivals_workshop_assistant.paths import ASSISTANT_FOLDER
+from ._aseprite_loading import RawAsepriteFile
+from .exporting import ExportJob
+
+FILENAME = ".export_cache"
+PATH = ASSISTANT_FOLDER / FILENAME
+
+# Bump when fingerprints are made differently.
+CACHE_VERSION = 1
+
+ENTRIES_FIELD = "entries"
+
+
+class ExportCache:
+    def __init__(self, entries: dict = None):
+        """The fingerprint of every strip exported in previous runs,
+        keyed by the strip's path relative to the root dir."""
+        if entries is None:
+            entries = {}
+        self.entries = entries
+
+    def is_up_to_date(self, root_dir: Path, job: ExportJob, fingerprint: str) -> bool:
+        """If the strip was already exported from the same frames and params."""
+        return (
+            self.entries.get(_get_key(root_dir, job), None) == fingerprint
+            and job.dest.exists()
+        )
+
+    def store(self, root_dir: Path, job: ExportJob, fingerprint: str):
+        self.entries[_get_key(root_dir, job)] = fingerprint
+
+    def to_json(self, root_dir: Path) -> dict:
+        """Strips that were deleted since they were exported aren't kept."""
+        return {
+            ENTRIES_FIELD: {
+                key: fingerprint
+                for key, fingerprint in self.entries.items()
+                if (root_dir / key).exists()
+            },
+        }
+
+
+def _get_key(root_dir: Path, job: ExportJob) -> str:
+    try:
+        return job.dest.relative_to(root_dir).as_posix()
+    except ValueError:
+        return job.dest.as_posix()
+
+
+def get_job_fingerprint(
+    raw: RawAsepriteFile, job: ExportJob, export_backend: ExportBackend
+) -> str:
+    """A hash of everything the job's strip is made from: the export params,
+    the layers and palette, and the cels of the frames in the job's range.
+    Cels are hashed as they're stored, so nothing is decompressed."""
+    # Imported here since rendering imports Pillow, which is slow to import.
+    from .rendering import get_frame_cels, get_palette
+
+    fingerprint = hashlib.blake2b(digest_size=16)
+
+    def add(*values):
+        fingerprint.update(repr(values).encode("UTF8"))
+
+    add(job.kind, job.start, job.end, job.scale, export_backend.value)
+    add(raw.header.width, raw.header.height, raw.header.color_depth, raw.header.flags)
+    for layer in raw.layers:
+        add(
+            layer.name,
+            layer.flags,
+            layer.layer_type,
+            layer.layer_child_level,
+            layer.blend_mode,
+            layer.opacity,
+        )
+    if raw.header.color_depth == 8:
+        add(get_palette(raw))
+
+    for frame_index in range(job.start, job.end + 1):
+        add(frame_index)
+        cels = get_frame_cels(raw, frame_index)
+        for layer_index, cel in sorted(cels.items()):
+            add(
+                layer_index,
+                cel.x_pos,
+                cel.y_pos,
+                cel.opacity,
+                cel.data["width"],
+                cel.data["height"],
+            )
+            fingerprint.update(cel.data["data"])
+    return fingerprint.hexdigest()
+
+
+def read(root_dir: Path) -> ExportCache:
+    """Controller"""
+    content = info_files.read_versioned_json(root_dir / PATH, CACHE_VERSION)
+    if content is None:
+        return ExportCache()
+    return ExportCache(entries=content.get(ENTRIES_FIELD, {}))
+
+
+def save(root_dir: Path, cache: ExportCache):
+    """Controller"""
+    info_files.save_versioned_json(
+        root_dir / PATH, CACHE_VERSION, cache.to_json(root_dir)
+    )
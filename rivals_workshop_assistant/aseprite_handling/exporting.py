@@ -0,0 +1,68 @@
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import List
+
+from ..paths import ASEPRITE_LUA_SCRIPTS_PATH
+
+BATCH_EXPORT_SCRIPT_NAME = "export_aseprite_batch.lua"
+
+ANIM_EXPORT = "anim"
+HURTBOX_EXPORT = "hurtbox"
+
+
+class ExportJob:
+    def __init__(self, kind: str, start: int, end: int, scale: int, dest: Path):
+        """A single strip to export from an aseprite file.
+        Start and end are the 0-indexed frames of the aseprite file."""
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.scale = scale
+        self.dest = dest
+
+    def prepare(self):
+        """Delete old versions of the strip, which may have a different frame count,
+        and make sure its folder exists."""
+        strip_name_root = self.dest.name.rsplit("_strip", maxsplit=1)[0]
+        for old_path in self.dest.parent.glob(f"{strip_name_root}_strip*.png"):
+            os.remove(old_path)
+        self.dest.parent.mkdir(parents=True, exist_ok=True)
+
+    def to_line(self) -> str:
+        # Aseprite frames are 1-indexed
+        return "\t".join(
+            [
+                self.kind,
+                str(self.start + 1),
+                str(self.end + 1),
+                str(self.scale),
+                str(self.dest),
+            ]
+        )
+
+
+def export_with_aseprite(
+    aseprite_path: Path, aseprite_file_path: Path, jobs: List[ExportJob]
+):
+    """Run all the jobs for an aseprite file in a single Aseprite process,
+    so the file is only opened once."""
+    if not jobs:
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs_path = Path(tmp) / "jobs.txt"
+        with open(jobs_path, "w", encoding="UTF8", newline="\n") as f:
+            f.write("\n".join(job.to_line() for job in jobs) + "\n")
+
+        export_command = [
+            str(aseprite_path),
+            "-b",
+            "-script-param",
+            f"filename={aseprite_file_path}",
+            "-script-param",
+            f"jobs={jobs_path}",
+            "-script",
+            str(ASEPRITE_LUA_SCRIPTS_PATH / BATCH_EXPORT_SCRIPT_NAME),
+        ]
+        subprocess.run(export_command, check=True)
@@ -0,0 +1,52 @@
+"""Hurtbox generation in python, so hurtboxes don't need Aseprite."""
+
+from PIL import Image, ImageChops
+
+from ._aseprite_loading import RawAsepriteFile
+from .constants import HURTMASK_LAYER_NAME, HURTBOX_LAYER_NAME
+from .exporting import ExportJob
+from .rendering import (
+    get_layers_mask,
+    get_visible_image_layers,
+    make_strip,
+    find_top_level_layer,
+)
+
+HURTBOX_COLOR = (0, 255, 0, 255)
+
+
+def get_hurtbox_frame(raw: RawAsepriteFile, frame_index: int) -> Image.Image:
+    """The frame's hurtbox, in green.
+    The hurtbox is the silhouette of the visible layers, or the content of the
+    HURTBOX layer if there is one. Anything on the HURTMASK layer is cut out of it.
+    """
+    hurtbox_layer = find_top_level_layer(raw, HURTBOX_LAYER_NAME)
+    hurtmask_layer = find_top_level_layer(raw, HURTMASK_LAYER_NAME)
+
+    if hurtbox_layer is not None:
+        hurtbox_layers = [hurtbox_layer]
+    else:
+        hurtbox_layers = get_visible_image_layers(
+            [
+                layer
+                for layer in raw.layer_tree
+                if layer.name not in (HURTBOX_LAYER_NAME, HURTMASK_LAYER_NAME)
+            ]
+        )
+    mask = get_layers_mask(raw, hurtbox_layers, frame_index)
+
+    if hurtmask_layer is not None:
+        hurtmask = get_layers_mask(raw, [hurtmask_layer], frame_index)
+        mask = ImageChops.subtract(mask, hurtmask)
+
+    frame = Image.new("RGBA", mask.size, (0, 0, 0, 0))
+    frame.paste(HURTBOX_COLOR, (0, 0), mask)
+    return frame
+
+
+def save_hurtbox(raw: RawAsepriteFile, job: ExportJob):
+    frames = [
+        get_hurtbox_frame(raw, frame_index)
+        for frame_index in range(job.start, job.end + 1)
+    ]
+    make_strip(frames, job.scale).save(job.dest)
@@ -0,0 +1,122 @@
+import typing
+from pathlib import Path
+
+from rivals_workshop_assistant import assistant_config_mod, info_files
+from rivals_workshop_assistant.file_handling import get_content_hash
+from rivals_workshop_assistant.paths import ASSISTANT_FOLDER
+from .types import TagColor, to_json_color
+
+FILENAME = ".aseprite_cache"
+PATH = ASSISTANT_FOLDER / FILENAME
+
+# Bump when the parsed metadata changes shape.
+CACHE_VERSION = 1
+
+ANIM_TAG_COLOR_FIELD = "anim_tag_color"
+WINDOW_TAG_COLOR_FIELD = "window_tag_color"
+ENTRIES_FIELD = "entries"
+
+MTIME_FIELD = "mtime_ns"
+SIZE_FIELD = "size"
+HASH_FIELD = "hash"
+DATA_FIELD = "data"
+
+
+class AsepriteMetadataCache:
+    def __init__(
+        self,
+        anim_tag_color: TagColor,
+        window_tag_color: TagColor,
+        entries: dict = None,
+    ):
+        """Parsed aseprite metadata from previous runs, keyed by file path.
+        Entries are only valid for the tag colors they were made with."""
+        self.anim_tag_color = to_json_color(anim_tag_color)
+        self.window_tag_color = to_json_color(window_tag_color)
+        if entries is None:
+            entries = {}
+        self.entries = entries
+        self.new_entries = {}
+        # Hashes made by get this run, so store doesn't hash the file again.
+        self._content_hashes = {}
+
+    def get(self, path: Path) -> typing.Optional[dict]:
+        """Get the cached data for the file, if the file hasn't changed.
+        The file is only hashed if its modified time changed but its size didn't,
+        since it may just have been touched."""
+        key = path.as_posix()
+        entry = self.entries.get(key, None)
+        if entry is None:
+            return None
+
+        stat = path.stat()
+        if entry[SIZE_FIELD] != stat.st_size:
+            return None
+        if entry[MTIME_FIELD] != stat.st_mtime_ns:
+            content_hash = get_content_hash(path)
+            # Entries only get a hash once their file has been touched.
+            if entry.get(HASH_FIELD, None) != content_hash:
+                self._content_hashes[key] = content_hash
+                return None
+            entry = {**entry, MTIME_FIELD: stat.st_mtime_ns}
+
+        self.new_entries[key] = entry
+        return entry[DATA_FIELD]
+
+    def store(self, path: Path, data: dict):
+        """The file isn't hashed here, so storing doesn't read the whole file."""
+        key = path.as_posix()
+        stat = path.stat()
+        self.new_entries[key] = {
+            MTIME_FIELD: stat.st_mtime_ns,
+            SIZE_FIELD: stat.st_size,
+            HASH_FIELD: self._content_hashes.pop(key, None),
+            DATA_FIELD: data,
+        }
+
+    def is_for_config(self, assistant_config: dict) -> bool:
+        """If the cache's tag colors are the ones the config sets."""
+        return self.anim_tag_color == to_json_color(
+            assistant_config_mod.get_anim_tag_color(assistant_config)
+        ) and self.window_tag_color == to_json_color(
+            assistant_config_mod.get_window_tag_color(assistant_config)
+        )
+
+    def get_next_run_cache(self) -> "AsepriteMetadataCache":
+        """The cache as the next run would read it, once this one is saved."""
+        return AsepriteMetadataCache(
+            anim_tag_color=self.anim_tag_color,
+            window_tag_color=self.window_tag_color,
+            entries=self.new_entries,
+        )
+
+    def to_json(self) -> dict:
+        """Only files seen this run are kept, so deleted files fall out of the cache."""
+        return {
+            ANIM_TAG_COLOR_FIELD: self.anim_tag_color,
+            WINDOW_TAG_COLOR_FIELD: self.window_tag_color,
+            ENTRIES_FIELD: self.new_entries,
+        }
+
+
+def read(root_dir: Path, assistant_config: dict) -> AsepriteMetadataCache:
+    """Controller"""
+    anim_tag_color = assistant_config_mod.get_anim_tag_color(assistant_config)
+    window_tag_color = assistant_config_mod.get_window_tag_color(assistant_config)
+    cache = AsepriteMetadataCache(
+        anim_tag_color=anim_tag_color, window_tag_color=window_tag_color
+    )
+
+    content = info_files.read_versioned_json(root_dir / PATH, CACHE_VERSION)
+    if (
+        content is not None
+        and content.get(ANIM_TAG_COLOR_FIELD, None) == cache.anim_tag_color
+        and content.get(WINDOW_TAG_COLOR_FIELD, None) == cache.window_tag_color
+    ):
+        cache.entries = content.get(ENTRIES_FIELD, {})
+    return cache
+
+
+def save(root_dir: Path, cache: AsepriteMetadataCache):
+    """Controller"""
+    info_files.save_versioned_json(root_dir / PATH, CACHE_VERSION, cache.to_json())
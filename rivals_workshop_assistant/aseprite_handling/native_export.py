@@ -0,0 +1,55 @@
+"""Exporting strips in python, as an alternative to exporting them with Aseprite."""
+
+from pathlib import Path
+from typing import List
+
+from PIL import Image
+
+from ._aseprite_loading import RawAsepriteFile
+from .constants import HURTMASK_LAYER_NAME, HURTBOX_LAYER_NAME
+from .exporting import ExportJob, HURTBOX_EXPORT
+from .hurtboxes import save_hurtbox
+from .rendering import render_layers, get_visible_image_layers, make_strip
+
+
+def get_anim_frame(raw: RawAsepriteFile, frame_index: int) -> Image.Image:
+    """The frame as it looks in Aseprite, without the hurtbox utility layers."""
+    content_layers = get_visible_image_layers(
+        [
+            layer
+            for layer in raw.layer_tree
+            if layer.name not in (HURTBOX_LAYER_NAME, HURTMASK_LAYER_NAME)
+        ]
+    )
+    return render_layers(raw, content_layers, frame_index)
+
+
+def save_anim_strip(raw: RawAsepriteFile, job: ExportJob):
+    frames = [
+        get_anim_frame(raw, frame_index)
+        for frame_index in range(job.start, job.end + 1)
+    ]
+    make_strip(frames, job.scale).save(job.dest)
+
+
+def export_natively(
+    aseprite_file_path: Path, jobs: List[ExportJob], raw: RawAsepriteFile = None
+):
+    """Save the jobs for an aseprite file, reading the file only once.
+    The file is parsed unless it's given already parsed as raw, and then it's
+    closed when the jobs are done."""
+    if not jobs:
+        return
+    if raw is not None:
+        _save_jobs(raw, jobs)
+        return
+    with RawAsepriteFile.from_path(aseprite_file_path) as raw:
+        _save_jobs(raw, jobs)
+
+
+def _save_jobs(raw: RawAsepriteFile, jobs: List[ExportJob]):
+    for job in jobs:
+        if job.kind == HURTBOX_EXPORT:
+            save_hurtbox(raw, job)
+        else:
+            save_anim_strip(raw, job)
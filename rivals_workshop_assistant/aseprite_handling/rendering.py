@@ -0,0 +1,168 @@
+"""Drawing aseprite frames in python, from the parsed file, without Aseprite."""
+
+import typing
+from typing import Dict, List
+
+from PIL import Image, ImageChops
+
+from ._aseprite_loading import (
+    RawAsepriteFile,
+    CelChunk,
+    LayerChunk,
+    LayerGroupChunk,
+    PaletteChunk,
+)
+
+LINKED_CEL_TYPE = 1
+
+
+def is_layer_visible(layer: LayerChunk) -> bool:
+    return layer.flags & 1 == 1
+
+
+def get_frame_cels(raw: RawAsepriteFile, frame_index: int) -> Dict[int, CelChunk]:
+    """The cels of the frame keyed by layer index, with linked cels resolved
+    to the cel they link to."""
+    cels = {
+        chunk.layer_index: chunk
+        for chunk in raw.frames[frame_index].chunks
+        if isinstance(chunk, CelChunk)
+    }
+    for layer_index, cel in cels.items():
+        if cel.cel_type == LINKED_CEL_TYPE:
+            (linked_frame_index,) = cel.data["link"]
+            cels[layer_index] = get_frame_cels(raw, linked_frame_index).get(
+                layer_index, None
+            )
+    return {layer_index: cel for layer_index, cel in cels.items() if cel is not None}
+
+
+def get_visible_image_layers(layers: List[LayerChunk]) -> List[LayerChunk]:
+    """The visible non-group layers among the given ones and their children,
+    bottom to top."""
+    image_layers = []
+    for layer in layers:
+        if not is_layer_visible(layer):
+            continue
+        if isinstance(layer, LayerGroupChunk):
+            image_layers += get_visible_image_layers(layer.children)
+        else:
+            image_layers.append(layer)
+    return image_layers
+
+
+def get_cel_alpha(raw: RawAsepriteFile, cel: CelChunk) -> Image.Image:
+    """An "L" image of the cel that is 255 where the cel has content, 0 elsewhere."""
+    size = (cel.data["width"], cel.data["height"])
+    pixel_bytes = cel.get_pixel_bytes()
+    if raw.header.color_depth == 32:
+        alpha = Image.frombuffer("RGBA", size, pixel_bytes, "raw", "RGBA", 0, 1)
+        alpha = alpha.getchannel("A")
+    elif raw.header.color_depth == 16:
+        alpha = Image.frombuffer("LA", size, pixel_bytes, "raw", "LA", 0, 1)
+        alpha = alpha.getchannel("A")
+    else:
+        indexes = Image.frombuffer("L", size, pixel_bytes, "raw", "L", 0, 1)
+        transparent_index = raw.header.palette_mask
+        return indexes.point(lambda index: 0 if index == transparent_index else 255)
+    return alpha.point(lambda value: 255 if value else 0)
+
+
+def get_cel_image(raw: RawAsepriteFile, cel: CelChunk) -> Image.Image:
+    """An RGBA image of the cel's pixels."""
+    size = (cel.data["width"], cel.data["height"])
+    pixel_bytes = cel.get_pixel_bytes()
+    if raw.header.color_depth == 32:
+        return Image.frombuffer("RGBA", size, pixel_bytes, "raw", "RGBA", 0, 1)
+    elif raw.header.color_depth == 16:
+        image = Image.frombuffer("LA", size, pixel_bytes, "raw", "LA", 0, 1)
+        return image.convert("RGBA")
+    else:
+        image = Image.frombuffer("P", size, pixel_bytes, "raw", "P", 0, 1)
+        image.putpalette(get_palette(raw), rawmode="RGBA")
+        return image.convert("RGBA")
+
+
+def get_palette(raw: RawAsepriteFile) -> List[int]:
+    """The flat RGBA palette of an indexed file, with the transparent index cleared."""
+    palette = [0, 0, 0, 0] * 256
+    for chunk in raw.frames[0].chunks:
+        if isinstance(chunk, PaletteChunk):
+            for index, color in enumerate(chunk.colors, start=chunk.first_color_index):
+                if index < 256:
+                    palette[index * 4 : index * 4 + 4] = [
+                        color["red"],
+                        color["green"],
+                        color["blue"],
+                        color["alpha"],
+                    ]
+    transparent_index = raw.header.palette_mask
+    palette[transparent_index * 4 : transparent_index * 4 + 4] = [0, 0, 0, 0]
+    return palette
+
+
+def get_layer_opacity(raw: RawAsepriteFile, layer: LayerChunk) -> int:
+    # Layer opacity is only set if the header flag says so.
+    if raw.header.flags & 1 == 1:
+        return layer.opacity
+    return 255
+
+
+def render_layers(
+    raw: RawAsepriteFile, layers: List[LayerChunk], frame_index: int
+) -> Image.Image:
+    """Draw the layers of the frame over each other, bottom to top.
+    All layers are blended as if they used the normal blend mode."""
+    size = (raw.header.width, raw.header.height)
+    frame = Image.new("RGBA", size, (0, 0, 0, 0))
+    cels = get_frame_cels(raw, frame_index)
+    for layer in layers:
+        cel = cels.get(layer.layer_index, None)
+        if cel is None:
+            continue
+        opacity = get_layer_opacity(raw, layer) * cel.opacity // 255
+        if opacity == 0:
+            continue
+
+        cel_image = get_cel_image(raw, cel)
+        if opacity != 255:
+            cel_image.putalpha(
+                cel_image.getchannel("A").point(lambda alpha: alpha * opacity // 255)
+            )
+        layer_image = Image.new("RGBA", size, (0, 0, 0, 0))
+        layer_image.paste(cel_image, (cel.x_pos, cel.y_pos))
+        frame = Image.alpha_composite(frame, layer_image)
+    return frame
+
+
+def get_layers_mask(
+    raw: RawAsepriteFile, layers: List[LayerChunk], frame_index: int
+) -> Image.Image:
+    """An "L" image of the frame, 255 wherever any of the layers has content."""
+    mask = Image.new("L", (raw.header.width, raw.header.height), 0)
+    cels = get_frame_cels(raw, frame_index)
+    for layer in layers:
+        cel = cels.get(layer.layer_index, None)
+        if cel is None or cel.opacity == 0 or get_layer_opacity(raw, layer) == 0:
+            continue
+        cel_mask = Image.new("L", mask.size, 0)
+        cel_mask.paste(get_cel_alpha(raw, cel), (cel.x_pos, cel.y_pos))
+        mask = ImageChops.lighter(mask, cel_mask)
+    return mask
+
+
+def make_strip(frames: List[Image.Image], scale: int) -> Image.Image:
+    """Lay the frames out horizontally, scaled up by the whole number scale."""
+    width, height = frames[0].size
+    strip = Image.new("RGBA", (width * len(frames), height), (0, 0, 0, 0))
+    for index, frame in enumerate(frames):
+        strip.paste(frame, (index * width, 0))
+    if scale != 1:
+        strip = strip.resize((strip.width * scale, strip.height * scale), Image.NEAREST)
+    return strip
+
+
+def find_top_level_layer(
+    raw: RawAsepriteFile, name: str
+) -> typing.Optional[LayerChunk]:
+    return next((layer for layer in raw.layer_tree if layer.name == name), None)
@@ -4,6 +4,18 @@ import typing
 TagColor = typing.Union[str, typing.Tuple[int, int, int]]
 
 
+def to_json_color(color: TagColor):
+    if isinstance(color, (tuple, list)):
+        return list(color)
+    return color
+
+
+def from_json_color(color) -> TagColor:
+    if isinstance(color, list):
+        return tuple(color)
+    return color
+
+
 class AsepriteTag:
     def __init__(self, name: str, start: int, end: int, color: TagColor):
         self.name = name
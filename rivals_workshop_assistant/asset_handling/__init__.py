@@ -24,7 +24,12 @@ def _get_required_assets_for_script(script: Script) -> Set[Asset]:
     return assets
 
 
-def save_assets(root_dir: Path, assets: Set[Asset]):
-    """Controller"""
+def save_assets(root_dir: Path, assets: Set[Asset]) -> List[Path]:
+    """Controller
+    Returns the paths of the files it created."""
+    created_paths = []
     for asset in assets:
-        asset.supply(root_dir)
+        created_path = asset.supply(root_dir)
+        if created_path is not None:
+            created_paths.append(created_path)
+    return created_paths
@@ -1,10 +1,9 @@
 import re
 from pathlib import Path
 import abc
-from typing import Set
+from typing import Optional, Set
 
 from rivals_workshop_assistant import paths
-from .sprite_generation import generate_sprite_for_file_name
 
 
 class Asset(abc.ABC):
@@ -15,7 +14,8 @@ class Asset(abc.ABC):
     def get_from_text(cls, text) -> Set["Asset"]:
         raise NotImplementedError
 
-    def supply(self, root_dir: Path) -> None:
+    def supply(self, root_dir: Path) -> Optional[Path]:
+        """Returns the path of the file it created, if any."""
         raise NotImplementedError
 
     def __eq__(self, other):
@@ -33,16 +33,22 @@ class Sprite(Asset):
         asset_strings = set(re.findall(pattern=cls._pattern, string=text))
         return set(Sprite(string) for string in asset_strings)
 
-    def supply(self, root_dir: Path):
+    def supply(self, root_dir: Path) -> Optional[Path]:
         file_name = self.asset_string
         if not file_name.endswith(".png"):
             file_name = file_name + ".png"
         path = root_dir / paths.SPRITES_FOLDER / file_name
         if not path.exists():
+            # Imported here since Pillow is slow to import, and sprites are rarely
+            # missing.
+            from .sprite_generation import generate_sprite_for_file_name
+
             sprite = generate_sprite_for_file_name(file_name)
             if sprite:
                 path.parent.mkdir(parents=True, exist_ok=True)
                 sprite.save(path.as_posix())
+                return path
+        return None
 
 
 ASSET_TYPES = [Sprite]
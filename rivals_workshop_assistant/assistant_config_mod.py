@@ -88,7 +88,7 @@ WARNING_RECURSIVE_SET_ATTACK = "recursive_set_attack"
 
 
 def get_initial_default_config() -> dict:
-    return info_files.YAML_HANDLER.load(DEFAULT_CONFIG)
+    return info_files.get_yaml_handler().load(DEFAULT_CONFIG)
 
 
 def override_default_config(default_config, user_default_config_override):
@@ -103,6 +103,46 @@ def get_hurtboxes_enabled(config: dict):
     return config.get(GENERATE_HURTBOXES_FIELD, GENERATE_HURTBOXES_DEFAULT)
 
 
+class ExportBackend(enum.Enum):
+    ASEPRITE = "aseprite"
+    NATIVE = "native"
+
+
+EXPORT_BACKEND_FIELD = "export_backend"
+EXPORT_BACKEND_DEFAULT = ExportBackend.ASEPRITE
+
+
+def get_export_backend(config: dict) -> ExportBackend:
+    try:
+        return ExportBackend(config.get(EXPORT_BACKEND_FIELD, EXPORT_BACKEND_DEFAULT))
+    except ValueError:
+        return EXPORT_BACKEND_DEFAULT
+
+
+MAX_EXPORT_WORKERS_FIELD = "max_export_workers"
+MAX_EXPORT_WORKERS_DEFAULT = 4
+
+
+def get_max_export_workers(config: dict) -> int:
+    value = config.get(MAX_EXPORT_WORKERS_FIELD, MAX_EXPORT_WORKERS_DEFAULT)
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return MAX_EXPORT_WORKERS_DEFAULT
+
+
+MAX_SCRIPT_WORKERS_FIELD = "max_script_workers"
+MAX_SCRIPT_WORKERS_DEFAULT = 1
+
+
+def get_max_script_workers(config: dict) -> int:
+    value = config.get(MAX_SCRIPT_WORKERS_FIELD, MAX_SCRIPT_WORKERS_DEFAULT)
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return MAX_SCRIPT_WORKERS_DEFAULT
+
+
 DEFAULT_CONFIG = f"""\
 # Format is <key name>: <value> (with a space after the : )
 # E.g.
@@ -132,6 +172,26 @@ DEFAULT_CONFIG = f"""\
     # If the assistant should automatically generate hurtboxes from your anim files.
     # See TODO PUT A LINK TO THE ASSISTANT. TELL QAZZQUIMBY ON DISCORD IF HE FORGETS TO REPLACE THIS!
 
+{EXPORT_BACKEND_FIELD}: {EXPORT_BACKEND_DEFAULT.value}
+    # How anims are exported to spritesheets.
+    # {ExportBackend.ASEPRITE.value} = Use Aseprite, from aseprite_path.
+    # {ExportBackend.NATIVE.value} = Draw the spritesheets without Aseprite.
+    #   Supports normal blending, opacity and linked cels,
+    #   and treats other blend modes as normal.
+
+{MAX_EXPORT_WORKERS_FIELD}: {MAX_EXPORT_WORKERS_DEFAULT}
+    # How many anim files the assistant may export at the same time.
+    # Each file's anims and hurtboxes are exported together, with Aseprite
+    #   or without it, depending on {EXPORT_BACKEND_FIELD}.
+    # Lower this if exporting makes your computer struggle.
+
+{MAX_SCRIPT_WORKERS_FIELD}: {MAX_SCRIPT_WORKERS_DEFAULT}
+    # How many processes the assistant may use to process scripts
+    #   (warnings, code generation, injection and finding assets).
+    # 1 processes them one at a time. Higher values can speed up characters
+    #   with many scripts, but starting the processes takes time, 
+    #   so it's slower for small characters.
+
 {LIBRARY_UPDATE_LEVEL_FIELD}: {LIBRARY_UPDATE_LEVEL_DEFAULT.value}
     # What kind of library updates to allow. 
     # This only affects the functions available to inject, not assistant behavior.
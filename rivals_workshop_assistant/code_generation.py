@@ -1,9 +1,6 @@
 import textwrap
 import typing
 
-import parse
-from inflector import English
-
 from rivals_workshop_assistant.script_mod import Script
 from typing import List
 
@@ -50,6 +47,8 @@ def handle_codegen_for_seed(seed: str) -> str:
 
 
 def handle_foreach_codegen(seed) -> typing.Optional[str]:
+    import parse  # Only imported when a script has codegen.
+
     try:
         collection_name = parse.parse("foreach {collection}", seed)["collection"]
     except TypeError:
@@ -69,7 +68,17 @@ def get_line_before_comment(line: str) -> str:
     return line.split(r"//")[0]
 
 
-_inflector_singularize = English().singularize
+# inflector is slow to import, so it's only imported when a script has codegen.
+_inflector = None
+
+
+def _inflector_singularize(string: str) -> str:
+    global _inflector
+    if _inflector is None:
+        from inflector import English
+
+        _inflector = English()
+    return _inflector.singularize(string)
 
 
 def singularize(string: str):
@@ -1,15 +1,19 @@
 import datetime
 import typing
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 
 import rivals_workshop_assistant.info_files as info_files
-from rivals_workshop_assistant.file_handling import File
 from rivals_workshop_assistant.paths import ASSISTANT_FOLDER
 
-FILENAME = ".assistant"
+FILENAME = ".assistant.json"
 PATH = ASSISTANT_FOLDER / FILENAME
 
+# Older versions kept the dotfile as yaml. It's moved to PATH the first time
+# it's read.
+LEGACY_FILENAME = ".assistant"
+LEGACY_PATH = ASSISTANT_FOLDER / LEGACY_FILENAME
+
 LIBRARY_VERSION_FIELD = "library_version"
 
 
@@ -29,19 +33,53 @@ PROCESSED_TIME_FIELD = "processed_time"
 SEEN_FILES_FIELD = "seen_files"
 
 
+# Fields holding dates or datetimes, which json stores as iso format strings.
+_DATE_FIELDS = {LAST_UPDATED_FIELD: date, PROCESSED_TIME_FIELD: datetime}
+
+
 def read(root_dir: Path) -> dict:
     """Controller"""
-    return info_files.read(root_dir / PATH)
+    path = root_dir / PATH
+    legacy_path = root_dir / LEGACY_PATH
+    if not path.exists() and legacy_path.exists():
+        dotfile = dict(info_files.read(legacy_path))
+        save_dotfile(root_dir, dotfile)
+        legacy_path.unlink()
+        return dotfile
+    return _from_json(info_files.read_json(path))
 
 
 def save_dotfile(root_dir: Path, content: dict):
     """Controller"""
-    info_files.save(path=root_dir / PATH, content=content)
+    info_files.save_json(root_dir / PATH, _to_json(content))
+
+
+def _to_json(dotfile: dict) -> dict:
+    content = dict(dotfile)
+    for field in _DATE_FIELDS:
+        if isinstance(content.get(field, None), date):
+            content[field] = content[field].isoformat()
+    return content
+
+
+def _from_json(content: dict) -> dict:
+    """Dates that can't be read are left out, as if they were never set."""
+    dotfile = dict(content)
+    for field, date_type in _DATE_FIELDS.items():
+        if field not in dotfile:
+            continue
+        try:
+            dotfile[field] = date_type.fromisoformat(dotfile[field])
+        except (TypeError, ValueError):
+            del dotfile[field]
+    return dotfile
 
 
-def update_dotfile_after_saving(dotfile: dict, now: datetime, files: typing.List[File]):
+def update_dotfile_after_saving(dotfile: dict, now: datetime):
+    """Which files were processed is kept in the file states instead of the
+    seen files, see file_states."""
     dotfile[PROCESSED_TIME_FIELD] = now
-    dotfile[SEEN_FILES_FIELD] = [file.path.as_posix() for file in files]
+    dotfile.pop(SEEN_FILES_FIELD, None)
 
 
 def get_processed_time(dotfile: dict, path: Path) -> typing.Optional[datetime]:
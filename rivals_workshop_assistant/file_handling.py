@@ -1,3 +1,4 @@
+import hashlib
 from datetime import datetime
 from pathlib import Path
 
@@ -24,13 +25,28 @@ class File:
         path: Path,
         modified_time: datetime = None,
         processed_time: datetime = None,
+        is_fresh: bool = None,
     ):
-        if modified_time is None:
-            modified_time = _get_modified_time(path)
-
+        """If is_fresh isn't given, the file is fresh if it was modified since
+        it was processed."""
         self.path = path
-        self.is_fresh = _get_is_fresh(processed_time, modified_time)
+        if is_fresh is None:
+            if modified_time is None:
+                modified_time = _get_modified_time(path)
+            is_fresh = _get_is_fresh(processed_time, modified_time)
+        self.is_fresh = is_fresh
 
 
 def _get_modified_time(path: Path) -> datetime:
     return datetime.fromtimestamp(path.stat().st_mtime)
+
+
+def get_content_hash(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def get_text_hash(text: str) -> str:
+    return hashlib.blake2b(
+        text.encode("UTF8", errors="surrogateescape"), digest_size=16
+    ).hexdigest()
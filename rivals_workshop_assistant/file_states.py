@@ -0,0 +1,111 @@
+import typing
+from datetime import datetime
+from pathlib import Path
+from typing import List, Set
+
+from rivals_workshop_assistant import info_files
+from rivals_workshop_assistant.dotfile_mod import PROCESSED_TIME_FIELD, SEEN_FILES_FIELD
+from rivals_workshop_assistant.file_handling import (
+    File,
+    _get_is_fresh,
+    _get_modified_time,
+    get_content_hash,
+)
+from rivals_workshop_assistant.paths import ASSISTANT_FOLDER
+
+FILENAME = ".file_states"
+PATH = ASSISTANT_FOLDER / FILENAME
+
+# Bump when entries change shape. Files are then fresh until processed again.
+STATES_VERSION = 1
+
+ENTRIES_FIELD = "entries"
+
+SIZE_FIELD = "size"
+MODIFIED_TIME_FIELD = "mtime_ns"
+HASH_FIELD = "hash"
+
+
+class FileStates:
+    def __init__(
+        self,
+        entries: dict = None,
+        legacy_processed_time: datetime = None,
+        legacy_seen_files: Set[str] = None,
+    ):
+        """The size, modified time and content hash of each file when it was last
+        processed, keyed by path.
+        A file is fresh when its content changed since then, so files whose
+        modified time changed without their content, like after a git checkout,
+        aren't processed again.
+        Before there are any states, the processed time and seen files from the
+        dotfile are used instead."""
+        if entries is None:
+            entries = {}
+        if legacy_seen_files is None:
+            legacy_seen_files = set()
+        self.entries = entries
+        self.legacy_processed_time = legacy_processed_time
+        self.legacy_seen_files = legacy_seen_files
+
+    def is_fresh(self, path: Path) -> bool:
+        """The file is only read to hash it if its size or modified time changed."""
+        entry = self.entries.get(path.as_posix(), None)
+        if entry is None:
+            return self._is_fresh_by_legacy(path)
+        stat = path.stat()
+        if (
+            entry[SIZE_FIELD] == stat.st_size
+            and entry[MODIFIED_TIME_FIELD] == stat.st_mtime_ns
+        ):
+            return False
+        return entry[HASH_FIELD] != get_content_hash(path)
+
+    def _is_fresh_by_legacy(self, path: Path) -> bool:
+        if path.as_posix() not in self.legacy_seen_files:
+            return True
+        return _get_is_fresh(self.legacy_processed_time, _get_modified_time(path))
+
+    def update(self, files: List[File]):
+        """Record the states of the files after they've been processed and saved.
+        Files that aren't given fall out, so they're fresh if they come back."""
+        entries = {}
+        for file in files:
+            path = file.path.as_posix()
+            stat = file.path.stat()
+            entry = self.entries.get(path, None)
+            if (
+                entry is None
+                or entry[SIZE_FIELD] != stat.st_size
+                or entry[MODIFIED_TIME_FIELD] != stat.st_mtime_ns
+            ):
+                entry = {
+                    SIZE_FIELD: stat.st_size,
+                    MODIFIED_TIME_FIELD: stat.st_mtime_ns,
+                    HASH_FIELD: get_content_hash(file.path),
+                }
+            entries[path] = entry
+        self.entries = entries
+
+    def to_json(self) -> dict:
+        return {ENTRIES_FIELD: self.entries}
+
+
+def read(root_dir: Path, dotfile: dict) -> FileStates:
+    """Controller"""
+    content = info_files.read_versioned_json(root_dir / PATH, STATES_VERSION)
+    if content is not None:
+        return FileStates(entries=content.get(ENTRIES_FIELD, {}))
+
+    seen_files: typing.Optional[list] = dotfile.get(SEEN_FILES_FIELD, None)
+    return FileStates(
+        legacy_processed_time=dotfile.get(PROCESSED_TIME_FIELD, None),
+        legacy_seen_files=set(seen_files or []),
+    )
+
+
+def save(root_dir: Path, file_states: FileStates):
+    """Controller"""
+    info_files.save_versioned_json(
+        root_dir / PATH, STATES_VERSION, file_states.to_json()
+    )
@@ -1,10 +1,22 @@
-"""This file powers reading yaml files. Backend stuff."""
+"""This file powers reading yaml and json files. Backend stuff."""
 
-from ruamel.yaml import StringIO, YAML
+import json
+import os
+import typing
 from pathlib import Path
 from rivals_workshop_assistant.file_handling import create_file
 
-YAML_HANDLER = YAML()
+# ruamel.yaml is slow to import, and runs with nothing to do don't read yaml.
+_yaml_handler = None
+
+
+def get_yaml_handler():
+    global _yaml_handler
+    if _yaml_handler is None:
+        from ruamel.yaml import YAML
+
+        _yaml_handler = YAML()
+    return _yaml_handler
 
 
 def read(path: Path) -> dict:
@@ -23,14 +35,53 @@ def save(path: Path, content: dict):
 
 
 def _yaml_load(yaml_str: str) -> dict:
-    yaml_obj = YAML_HANDLER.load(yaml_str)
+    yaml_obj = get_yaml_handler().load(yaml_str)
     if yaml_obj is None:
         yaml_obj = {}
     return yaml_obj
 
 
 def _yaml_dumps(obj) -> str:
+    from ruamel.yaml import StringIO
+
     with StringIO() as string_stream:
-        YAML_HANDLER.dump(obj, string_stream)
+        get_yaml_handler().dump(obj, string_stream)
         output_str = string_stream.getvalue()
     return output_str
+
+
+def read_json(path: Path) -> dict:
+    """Read a machine-written json file. A missing or corrupt file reads as empty."""
+    try:
+        content = json.loads(path.read_text(encoding="UTF8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+    if not isinstance(content, dict):
+        return {}
+    return content
+
+
+def save_json(path: Path, content: dict):
+    """Write the json file atomically, so a crash can't leave a half-written file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="UTF8", newline="\n") as f:
+        json.dump(content, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+VERSION_FIELD = "version"
+
+
+def read_versioned_json(path: Path, version: int) -> typing.Optional[dict]:
+    """Read a json file written by save_versioned_json.
+    A file saved with another version reads as None, so a module can bump its
+    version to throw away files saved before its data changed shape."""
+    content = read_json(path)
+    if content.get(VERSION_FIELD, None) != version:
+        return None
+    return content
+
+
+def save_versioned_json(path: Path, version: int, content: dict):
+    save_json(path, {VERSION_FIELD: version, **content})
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
 from .application import apply_injection
 from .library import read_injection_library
@@ -7,7 +7,9 @@ from rivals_workshop_assistant.script_mod import Script
 from ..aseprite_handling import Anim
 
 
-def handle_injection(root_dir: Path, scripts: List[Script], anims: List[Anim]):
+def handle_injection(
+    root_dir: Path, scripts: List[Script], anims: Dict[str, Anim], dotfile: dict = None
+):
     """Controller"""
-    injection_library = read_injection_library(root_dir)
+    injection_library = read_injection_library(root_dir, dotfile)
     apply_injection(scripts, injection_library, anims)
@@ -2,9 +2,12 @@ import re
 import typing
 
 from .dependency_handling import GmlInjection
+from .library import InjectionLibrary
+from .result_cache import InjectionResultCache
+from rivals_workshop_assistant.file_handling import get_text_hash
 from rivals_workshop_assistant.script_mod import Script
 from ..aseprite_handling import Anim
-from typing import List
+from typing import Dict, List
 
 INJECTION_START_MARKER = "// vvv LIBRARY DEFINES AND MACROS vvv\n"
 INJECTION_START_WARNING = (
@@ -21,22 +24,30 @@ INJECTION_END_HEADER = (
 
 
 def apply_injection(
-    scripts: List[Script], injection_library: List[GmlInjection], anims: List[Anim]
+    scripts: List[Script],
+    injection_library: InjectionLibrary,
+    anims: Dict[str, Anim],
+    injection_cache: InjectionResultCache = None,
 ):
     """Updates scripts with supplied dependencies."""
     for script in scripts:
         anim = _get_anim_for_script(script, anims)
         if script.is_fresh or (anim is not None and anim.is_fresh):
-            _apply_injection_to_script(script, injection_library, anim)
+            _apply_injection_to_script(script, injection_library, anim, injection_cache)
 
 
 def _apply_injection_to_script(
-    script: Script, injection_library: List[GmlInjection], anim: Anim
+    script: Script,
+    injection_library: InjectionLibrary,
+    anim: Anim,
+    injection_cache: InjectionResultCache = None,
 ):
-    """Updates the dependencies supplied to the script."""
+    """Updates the dependencies supplied to the script.
+    If the injection cache has the script's code, only the anim data is made again.
+    """
     if _should_inject(script.working_content):
-        needed_gmls = _get_inject_gmls_needed_in_gml(
-            script.working_content, injection_library
+        needed_gmls = _get_inject_gmls_needed_in_script(
+            script, injection_library, injection_cache
         ) + _get_anim_data_gmls_needed_in_gml(anim)
         script.working_content = _add_inject_gmls_in_script(
             script.working_content, needed_gmls
@@ -54,58 +65,43 @@ def _get_anim_data_gmls_needed_in_gml(anim: Anim):
     return window_gmls
 
 
-def _get_anim_for_script(script: Script, anims: List[Anim]) -> typing.Optional[Anim]:
+def _get_anim_for_script(
+    script: Script, anims: Dict[str, Anim]
+) -> typing.Optional[Anim]:
     if script.path.parent.name != "attacks":
         return None
-    anim = next((anim for anim in anims if anim.name == script.path.stem), None)
-    return anim
+    return anims.get(script.path.stem, None)
 
 
-def _get_inject_gmls_needed_in_gml(
-    gml: str, injection_library: List[GmlInjection]
+def _get_inject_gmls_needed_in_script(
+    script: Script,
+    injection_library: InjectionLibrary,
+    injection_cache: InjectionResultCache = None,
 ) -> List[str]:
-    needed_injects = _get_injects_needed_in_gml(gml, injection_library)
-    return [injection.gml for injection in needed_injects]
-
-
-def _get_injects_needed_in_gml(gml: str, injection_library: List[GmlInjection]):
-    used_injects = _get_injects_used_in_gml(gml, injection_library)
-    needed_injects = [
-        inject for inject in used_injects if not _gml_supplies_inject(gml, inject)
-    ]
-    return needed_injects
-
-
-def _get_injects_used_in_gml(
-    gml: str,
-    injection_library: List[GmlInjection],
-    existing_injections: List[GmlInjection] = None,
-) -> List[GmlInjection]:
-    if existing_injections is None:
-        injections = []
+    gml = script.working_content
+    if injection_cache is None:
+        needed_indexes = _get_inject_indexes_needed_in_gml(gml, injection_library)
     else:
-        injections = existing_injections
-
-    for injection in injection_library:
-        if injection not in injections and _gml_uses_inject(
-            gml=gml, injection=injection
-        ):
-            injections.append(injection)
-            recursive_injections = _get_injects_used_in_gml(
-                gml=injection.gml,
-                injection_library=injection_library,
-                existing_injections=injections,
+        content_hash = get_text_hash(_get_script_contents(gml))
+        needed_indexes = injection_cache.get(
+            script.path, content_hash, injection_library.fingerprint
+        )
+        if needed_indexes is None:
+            needed_indexes = _get_inject_indexes_needed_in_gml(gml, injection_library)
+            injection_cache.store(
+                script.path, content_hash, injection_library.fingerprint, needed_indexes
             )
-            injections += [
-                recursive_injection
-                for recursive_injection in recursive_injections
-                if recursive_injection not in injections
-            ]
-    return injections
+    return [injection_library.injections[index].gml for index in needed_indexes]
 
 
-def _gml_uses_inject(gml: str, injection: GmlInjection):
-    return re.search(pattern=injection.use_pattern, string=gml)
+def _get_inject_indexes_needed_in_gml(
+    gml: str, injection_library: InjectionLibrary
+) -> List[int]:
+    return [
+        index
+        for index in injection_library.get_used_indexes(gml)
+        if not _gml_supplies_inject(gml, injection_library.injections[index])
+    ]
 
 
 def _gml_supplies_inject(gml: str, inject: GmlInjection):
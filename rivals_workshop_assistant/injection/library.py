@@ -1,21 +1,283 @@
+import hashlib
 import re
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 import rivals_workshop_assistant.paths
-from .dependency_handling import GmlInjection, INJECT_TYPES
+from rivals_workshop_assistant import info_files, dotfile_mod
+from .dependency_handling import GmlInjection, Define, INJECT_TYPES
+from .matching import InjectionMatcher
 
+CACHE_PATH = rivals_workshop_assistant.paths.ASSISTANT_FOLDER / ".inject_cache"
 
-def read_injection_library(root_dir: Path) -> List[GmlInjection]:
-    """Controller"""
+# Bump when the library is built differently, to throw away old caches.
+CACHE_VERSION = 4
+
+KEY_FIELD = "key"
+LIBRARY_FIELD = "library"
+
+INJECTIONS_FIELD = "injections"
+CANONICAL_INDEXES_FIELD = "canonical_indexes"
+CLOSURES_FIELD = "closures"
+CYCLES_FIELD = "cycles"
+
+TYPE_FIELD = "type"
+NAME_FIELD = "name"
+GML_FIELD = "gml"
+USE_PATTERN_FIELD = "use_pattern"
+GIVE_PATTERN_FIELD = "give_pattern"
+DOCS_FIELD = "docs"
+
+# The last library read for each root dir in this process, so watch and server
+# modes don't read the cache again on every run.
+_loaded_libraries: Dict[Path, dict] = {}
+
+
+class InjectionLibrary:
+    def __init__(self, injections: List[GmlInjection]):
+        """All injections available to scripts, with what each one needs.
+        closures[i] is the library indexes of injection i and everything it uses,
+        directly or through other injections, in the order they're injected.
+        Identical injections share the index of the first of them.
+        cycles is the library indexes of each group of injections that use each
+        other in a cycle, see _get_cycles.
+        The fingerprint changes whenever any injection does."""
+        self.injections = injections
+        self.matcher = InjectionMatcher(injections)
+        self._canonical_indexes = _get_canonical_indexes(injections)
+        self.closures = self._get_closures()
+        self.cycles = self._get_cycles()
+        self.fingerprint = _get_fingerprint(injections)
+
+    def get_used_injections(self, gml: str) -> List[GmlInjection]:
+        """The injections the gml uses, each followed by what it needs in turn."""
+        return [self.injections[index] for index in self.get_used_indexes(gml)]
+
+    def get_used_indexes(self, gml: str) -> List[int]:
+        """Like get_used_injections, but the injections' library indexes."""
+        used_indexes = []
+        seen_indexes = set()
+        for index in self._get_direct_uses(gml):
+            for used_index in self.closures[index]:
+                if used_index not in seen_indexes:
+                    seen_indexes.add(used_index)
+                    used_indexes.append(used_index)
+        return used_indexes
+
+    def _get_direct_uses(self, gml: str) -> List[int]:
+        return sorted(
+            set(
+                self._canonical_indexes[index]
+                for index in self.matcher.get_used_indexes(gml)
+            )
+        )
+
+    def _get_closures(self) -> List[List[int]]:
+        """Walks the dependency graph depth first from each injection.
+        Injections can use each other in cycles, like recursive functions.
+        An injection already on the walk isn't visited again, which ends cycles."""
+        dependencies = [
+            self._get_direct_uses(injection.gml) for injection in self.injections
+        ]
+        closures = []
+        for start_index in range(len(self.injections)):
+            start_index = self._canonical_indexes[start_index]
+            closure = [start_index]
+            seen_indexes = {start_index}
+            stack = [iter(dependencies[start_index])]
+            while stack:
+                for dependency_index in stack[-1]:
+                    if dependency_index not in seen_indexes:
+                        seen_indexes.add(dependency_index)
+                        closure.append(dependency_index)
+                        stack.append(iter(dependencies[dependency_index]))
+                        break
+                else:
+                    stack.pop()
+            closures.append(closure)
+        return closures
+
+    def _get_cycles(self) -> List[List[int]]:
+        """Two injections are in a cycle when each is in the other's closure.
+        An injection that only uses itself isn't counted, since that's just a
+        recursive define."""
+        closure_sets = [set(closure) for closure in self.closures]
+        cycles = []
+        seen_indexes = set()
+        for index, closure in enumerate(self.closures):
+            if index != self._canonical_indexes[index] or index in seen_indexes:
+                continue
+            cycle = sorted(
+                other_index
+                for other_index in closure
+                if index in closure_sets[other_index]
+            )
+            seen_indexes.update(cycle)
+            if len(cycle) > 1:
+                cycles.append(cycle)
+        return cycles
+
+    def get_cycle_names(self) -> List[List[str]]:
+        """The names of the injections in each cycle."""
+        return [
+            [self.injections[index].name for index in cycle] for cycle in self.cycles
+        ]
+
+    def to_json(self) -> dict:
+        return {
+            INJECTIONS_FIELD: [
+                _injection_to_json(injection) for injection in self.injections
+            ],
+            CANONICAL_INDEXES_FIELD: self._canonical_indexes,
+            CLOSURES_FIELD: self.closures,
+            CYCLES_FIELD: self.cycles,
+        }
+
+    @classmethod
+    def from_json(cls, content: dict) -> "InjectionLibrary":
+        """Rebuild a library saved with to_json, without parsing the injections'
+        gml or walking their dependencies again."""
+        library = cls.__new__(cls)
+        library.injections = [
+            _injection_from_json(injection_json)
+            for injection_json in content[INJECTIONS_FIELD]
+        ]
+        library.matcher = InjectionMatcher(library.injections)
+        library._canonical_indexes = content[CANONICAL_INDEXES_FIELD]
+        library.closures = content[CLOSURES_FIELD]
+        library.cycles = content[CYCLES_FIELD]
+        library.fingerprint = _get_fingerprint(library.injections)
+        return library
+
+
+def _injection_to_json(injection: GmlInjection) -> dict:
+    injection_json = {
+        TYPE_FIELD: injection.IDENTIFIER_STRING,
+        NAME_FIELD: injection.name,
+        GML_FIELD: injection.gml,
+        USE_PATTERN_FIELD: injection.use_pattern,
+        GIVE_PATTERN_FIELD: injection.give_pattern,
+    }
+    if isinstance(injection, Define):
+        injection_json[DOCS_FIELD] = injection.docs
+    return injection_json
+
+
+def _injection_from_json(injection_json: dict) -> GmlInjection:
+    """The injection's gml is already built, so its type's __init__ is skipped."""
+    inject_type = next(
+        possible_inject_type
+        for possible_inject_type in INJECT_TYPES
+        if possible_inject_type.IDENTIFIER_STRING == injection_json[TYPE_FIELD]
+    )
+    injection = inject_type.__new__(inject_type)
+    GmlInjection.__init__(
+        injection,
+        name=injection_json[NAME_FIELD],
+        gml=injection_json[GML_FIELD],
+        use_pattern=injection_json[USE_PATTERN_FIELD],
+        give_pattern=injection_json[GIVE_PATTERN_FIELD],
+    )
+    if DOCS_FIELD in injection_json:
+        injection.docs = injection_json[DOCS_FIELD]
+    return injection
+
+
+def _get_fingerprint(injections: List[GmlInjection]) -> str:
+    fingerprint = hashlib.blake2b(digest_size=16)
+    for injection in injections:
+        fingerprint.update(
+            "\0".join(
+                [
+                    type(injection).__name__,
+                    injection.name,
+                    injection.gml,
+                    injection.use_pattern,
+                    injection.give_pattern,
+                    "",
+                ]
+            ).encode("UTF8", errors="surrogateescape")
+        )
+    return fingerprint.hexdigest()
+
+
+def _get_canonical_indexes(injections: List[GmlInjection]) -> List[int]:
+    """For each injection, the index of the first injection equal to it."""
+    indexes_by_name = {}
+    canonical_indexes = []
+    for index, injection in enumerate(injections):
+        same_name_indexes = indexes_by_name.setdefault(injection.name, [])
+        canonical_index = next(
+            (
+                other_index
+                for other_index in same_name_indexes
+                if injections[other_index] == injection
+            ),
+            index,
+        )
+        if canonical_index == index:
+            same_name_indexes.append(index)
+        canonical_indexes.append(canonical_index)
+    return canonical_indexes
+
+
+def read_injection_library(root_dir: Path, dotfile: dict = None) -> InjectionLibrary:
+    """Controller
+    The built library is cached, and reused while none of the library files
+    have changed and the assistant and library versions are the same.
+    It's also kept in memory, for when the process runs more than once."""
+    if dotfile is None:
+        dotfile = {}
     inject_gml_paths = list(
         (root_dir / rivals_workshop_assistant.paths.INJECT_FOLDER).rglob("*.gml")
     ) + list(
         (root_dir / rivals_workshop_assistant.paths.USER_INJECT_FOLDER).rglob("*.gml")
     )
-    inject_gmls = [gml_path.read_text() for gml_path in inject_gml_paths]
-    full_inject_gml = "\n\n".join(inject_gmls)
-    return get_injection_library_from_gml(full_inject_gml)
+
+    cache_key = _get_cache_key(root_dir, inject_gml_paths, dotfile)
+    loaded_library = _loaded_libraries.get(root_dir, {})
+    if loaded_library.get(KEY_FIELD, None) == cache_key:
+        return loaded_library[LIBRARY_FIELD]
+
+    cache = info_files.read_json(root_dir / CACHE_PATH)
+    if cache.get(KEY_FIELD, None) == cache_key:
+        library = InjectionLibrary.from_json(cache[LIBRARY_FIELD])
+    else:
+        inject_gmls = [gml_path.read_text() for gml_path in inject_gml_paths]
+        full_inject_gml = "\n\n".join(inject_gmls)
+        library = InjectionLibrary(get_injection_library_from_gml(full_inject_gml))
+        info_files.save_json(
+            root_dir / CACHE_PATH,
+            {KEY_FIELD: cache_key, LIBRARY_FIELD: library.to_json()},
+        )
+    _report_cycles(library)
+    _loaded_libraries[root_dir] = {KEY_FIELD: cache_key, LIBRARY_FIELD: library}
+    return library
+
+
+def _report_cycles(library: InjectionLibrary):
+    for names in library.get_cycle_names():
+        print(
+            f"WARN: The injections {', '.join(names)} use each other in a cycle. "
+            "Each is only injected once, but check they don't call each other "
+            "forever."
+        )
+
+
+def _get_cache_key(root_dir: Path, inject_gml_paths: List[Path], dotfile: dict) -> list:
+    """Made of lists, so it's the same after a round trip through json."""
+    file_stats = []
+    for path in inject_gml_paths:
+        stat = path.stat()
+        file_stats.append(
+            [path.relative_to(root_dir).as_posix(), stat.st_mtime_ns, stat.st_size]
+        )
+    return [
+        CACHE_VERSION,
+        dotfile_mod.get_assistant_version_string(dotfile),
+        dotfile_mod.get_library_version_string(dotfile),
+        file_stats,
+    ]
 
 
 def get_injection_library_from_gml(gml: str) -> List[GmlInjection]:
@@ -0,0 +1,59 @@
+import re
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+from .dependency_handling import GmlInjection, Define, Macro
+
+_IDENTIFIER_PATTERN = re.compile(r"\w+")
+# Identifiers called like functions, matching Define's use pattern,
+# (?<!#define)(^|\W)name\(
+_CALLED_IDENTIFIER_PATTERN = re.compile(r"(?<!\w)(?<!#define\W)(\w+)\(")
+
+
+def get_gml_identifiers(gml: str) -> Tuple[Set[str], Set[str]]:
+    """Every identifier in the gml, and the ones that are called like functions.
+    Identifiers are whole words, so each one is a possible use of the macro
+    with its name, and each called one of the define with its name."""
+    identifiers = set(_IDENTIFIER_PATTERN.findall(gml))
+    called_identifiers = set(_CALLED_IDENTIFIER_PATTERN.findall(gml))
+    return identifiers, called_identifiers
+
+
+class InjectionMatcher:
+    def __init__(self, injection_library: List[GmlInjection]):
+        """Finds the injections a gml uses by looking its identifiers up by name,
+        instead of searching it with each injection's use_pattern.
+        This takes time for the gml's length, no matter how big the library is.
+        Injections whose use_pattern can't be looked up that way fall back
+        to searching with their pattern."""
+        self.injection_library = injection_library
+        self._defines: Dict[str, List[int]] = {}
+        self._macros: Dict[str, List[int]] = {}
+        self._fallbacks: List[int] = []
+        for index, injection in enumerate(injection_library):
+            if not _IDENTIFIER_PATTERN.fullmatch(injection.name):
+                self._fallbacks.append(index)
+            elif type(injection) is Define:
+                self._defines.setdefault(injection.name, []).append(index)
+            elif type(injection) is Macro:
+                self._macros.setdefault(injection.name, []).append(index)
+            else:
+                self._fallbacks.append(index)
+        self._define_names: FrozenSet[str] = frozenset(self._defines)
+        self._macro_names: FrozenSet[str] = frozenset(self._macros)
+
+    def get_used_injections(self, gml: str) -> List[GmlInjection]:
+        """The injections whose use_pattern matches the gml, in library order."""
+        return [self.injection_library[index] for index in self.get_used_indexes(gml)]
+
+    def get_used_indexes(self, gml: str) -> List[int]:
+        """The library indexes of the injections the gml uses, in order."""
+        identifiers, called_identifiers = get_gml_identifiers(gml)
+        used_indexes = set()
+        for name in identifiers & self._macro_names:
+            used_indexes.update(self._macros[name])
+        for name in called_identifiers & self._define_names:
+            used_indexes.update(self._defines[name])
+        for index in self._fallbacks:
+            if re.search(self.injection_library[index].use_pattern, gml):
+                used_indexes.add(index)
+        return sorted(used_indexes)
@@ -0,0 +1,78 @@
+import typing
+from pathlib import Path
+from typing import List
+
+from rivals_workshop_assistant import info_files
+from rivals_workshop_assistant.paths import ASSISTANT_FOLDER
+
+FILENAME = ".injection_results"
+PATH = ASSISTANT_FOLDER / FILENAME
+
+# Bump when entries change shape, or injections are resolved differently.
+CACHE_VERSION = 1
+
+ENTRIES_FIELD = "entries"
+
+CONTENT_HASH_FIELD = "content_hash"
+LIBRARY_FINGERPRINT_FIELD = "library"
+INJECTION_INDEXES_FIELD = "injections"
+
+
+class InjectionResultCache:
+    def __init__(self, entries: dict = None):
+        """The library injections each script needed in previous runs,
+        keyed by script path.
+        An entry is only valid for the same script code and the same library."""
+        if entries is None:
+            entries = {}
+        self.entries = entries
+
+    def get(
+        self, path: Path, content_hash: str, library_fingerprint: str
+    ) -> typing.Optional[List[int]]:
+        """The library indexes of the injections the script needed,
+        if neither its code nor the library have changed."""
+        entry = self.entries.get(path.as_posix(), None)
+        if (
+            entry is None
+            or entry[CONTENT_HASH_FIELD] != content_hash
+            or entry[LIBRARY_FINGERPRINT_FIELD] != library_fingerprint
+        ):
+            return None
+        return entry[INJECTION_INDEXES_FIELD]
+
+    def store(
+        self,
+        path: Path,
+        content_hash: str,
+        library_fingerprint: str,
+        injection_indexes: List[int],
+    ):
+        self.entries[path.as_posix()] = {
+            CONTENT_HASH_FIELD: content_hash,
+            LIBRARY_FINGERPRINT_FIELD: library_fingerprint,
+            INJECTION_INDEXES_FIELD: injection_indexes,
+        }
+
+    def to_json(self) -> dict:
+        """Entries of deleted scripts are left out."""
+        return {
+            ENTRIES_FIELD: {
+                path: entry
+                for path, entry in self.entries.items()
+                if Path(path).exists()
+            },
+        }
+
+
+def read(root_dir: Path) -> InjectionResultCache:
+    """Controller"""
+    content = info_files.read_versioned_json(root_dir / PATH, CACHE_VERSION)
+    if content is None:
+        return InjectionResultCache()
+    return InjectionResultCache(entries=content.get(ENTRIES_FIELD, {}))
+
+
+def save(root_dir: Path, cache: InjectionResultCache):
+    """Controller"""
+    info_files.save_versioned_json(root_dir / PATH, CACHE_VERSION, cache.to_json())
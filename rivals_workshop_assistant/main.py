@@ -1,6 +1,10 @@
 from rivals_workshop_assistant.filelock import FileLock
 import datetime
+import multiprocessing
 import sys
+import time
+import traceback
+import typing
 from pathlib import Path
 
 from rivals_workshop_assistant import (
@@ -8,7 +12,10 @@ from rivals_workshop_assistant import (
     assistant_config_mod,
     dotfile_mod,
     character_config_mod,
+    file_states as file_states_mod,
     paths,
+    run_snapshot,
+    server,
 )
 from rivals_workshop_assistant.character_config_mod import get_has_small_sprites
 from rivals_workshop_assistant.dotfile_mod import update_dotfile_after_saving
@@ -18,19 +25,39 @@ from rivals_workshop_assistant.aseprite_handling import (
     get_anims,
     save_scripts,
     save_anims,
+    metadata_cache,
+    export_cache,
 )
 from rivals_workshop_assistant.assistant_config_mod import (
     get_aseprite_path,
     get_hurtboxes_enabled,
+    get_max_export_workers,
+    get_export_backend,
+    get_max_script_workers,
 )
-from rivals_workshop_assistant.asset_handling import get_required_assets, save_assets
+from rivals_workshop_assistant.asset_handling import save_assets
+from rivals_workshop_assistant.injection import result_cache as injection_results
+from rivals_workshop_assistant.run_context import RunContext
+from rivals_workshop_assistant.run_report import RunReport
 from rivals_workshop_assistant.setup import make_basic_folder_structure
-from rivals_workshop_assistant.injection import handle_injection
-from rivals_workshop_assistant.code_generation import handle_codegen
-from rivals_workshop_assistant.warning_handling import handle_warning
+from rivals_workshop_assistant.script_processing import process_scripts
+from rivals_workshop_assistant.warning_handling import result_cache as warning_results
 
 __version__ = "1.1.2"
 
+WATCH_FLAG = "--watch"
+SERVE_FLAG = "--serve"
+PORT_FLAG = "--port"
+WATCH_USAGE = f"Usage: {WATCH_FLAG} <character folder>"
+SERVE_USAGE = (
+    f"Usage: {SERVE_FLAG} <character folder> [<character folder> ...] "
+    f"[{PORT_FLAG} <port>]"
+)
+# Seconds between checks for changes in watch mode.
+WATCH_POLL_INTERVAL = 0.5
+# Seconds files must stay unchanged before a run, so a burst of saves is one run.
+WATCH_DEBOUNCE_TIME = 0.3
+
 
 def main(exe_dir: Path, given_dir: Path, guarantee_root_dir: bool = False):
     """Runs all processes on scripts in the root_dir
@@ -41,38 +68,186 @@ def main(exe_dir: Path, given_dir: Path, guarantee_root_dir: bool = False):
         root_dir = given_dir
     else:
         root_dir = get_root_dir(given_dir)
+    run(exe_dir, root_dir)
+
+
+def run(
+    exe_dir: Path, root_dir: Path, context: RunContext = None
+) -> typing.Optional[RunReport]:
+    """Runs all processes on scripts in the root_dir, unless nothing changed since
+    the last run.
+    Returns None if another instance is already running on it."""
+    if run_snapshot.is_unchanged(root_dir, __version__):
+        print("Nothing changed since the last run.")
+        return RunReport()
     make_basic_folder_structure(exe_dir, root_dir)
+    return update_files_with_lock(root_dir, context)
+
+
+def watch(exe_dir: Path, given_dir: Path, guarantee_root_dir: bool = False):
+    """Runs all processes on scripts in the root_dir, and again whenever files
+    in it change, until interrupted.
+    Staying running means imports are only loaded once, and the dotfile,
+    configs and caches are kept in memory between runs, see RunContext.
+    Only the changed files are processed again."""
+    print(f"Assistant Version: {__version__}")
+
+    if guarantee_root_dir:
+        root_dir = given_dir
+    else:
+        root_dir = get_root_dir(given_dir)
+    print(f"Watching {root_dir} for changes. Press Ctrl+C to stop.")
+
+    snapshot = None
+    context = RunContext()
+    try:
+        while True:
+            if snapshot is not None:
+                snapshot = run_snapshot.wait_for_change(
+                    root_dir,
+                    __version__,
+                    snapshot,
+                    poll_interval=WATCH_POLL_INTERVAL,
+                    debounce_time=WATCH_DEBOUNCE_TIME,
+                )
+            # Taken before the run, so files edited during it start another run.
+            snapshot = run_snapshot.get_snapshot(root_dir, __version__)
+            try:
+                make_basic_folder_structure(exe_dir, root_dir)
+                report = update_files_with_lock(root_dir, context)
+                if report is not None:
+                    # The run's own writes don't start another run.
+                    snapshot = run_snapshot.read(root_dir)
+            except Exception:
+                # Keep watching, the next change may fix it.
+                traceback.print_exc()
+                snapshot = run_snapshot.get_snapshot(root_dir, __version__)
+    except KeyboardInterrupt:
+        print("Stopped watching.")
+
+
+def serve(
+    exe_dir: Path, given_dirs: typing.List[Path], port: int = server.DEFAULT_PORT
+):
+    """Runs all processes on the character roots that editor plugins ask for,
+    in one process, so each request doesn't start the assistant again.
+    Only the given character roots can be asked for.
+    Each root's dotfile, configs and caches are kept in memory between requests,
+    see RunContext."""
+    print(f"Assistant Version: {__version__}")
+    contexts: typing.Dict[Path, RunContext] = {}
+
+    def process_root(given_dir: Path) -> typing.Optional[dict]:
+        root_dir = get_root_dir(given_dir)
+        context = contexts.setdefault(root_dir.resolve(), RunContext())
+        report = run(exe_dir, root_dir, context)
+        if report is None:
+            return None
+        return report.to_json(root_dir)
+
+    root_dirs = [get_root_dir(given_dir) for given_dir in given_dirs]
+    server.serve(process_root, root_dirs=root_dirs, port=port)
+
 
+def update_files_with_lock(
+    root_dir: Path, context: RunContext = None
+) -> typing.Optional[RunReport]:
+    """Returns None if another instance is already running on the root_dir."""
     lock = FileLock(root_dir / paths.LOCKFILE_PATH)
     try:
         with lock.acquire(timeout=2):
-            update_files(root_dir)
+            return update_files(root_dir, context)
     except TimeoutError:
         print(
             "WARN: Attempted to run assistant while an instance was already running."
             "\n\tConsider deleting assistant/.lock if you believe this is in error."
         )
+        return None
 
 
-def update_files(root_dir):
-    dotfile = dotfile_mod.read(root_dir)
-    assistant_config = assistant_config_mod.read_project_config(root_dir)
-    character_config = character_config_mod.read(root_dir)
+def update_files(root_dir, context: RunContext = None) -> RunReport:
+    """The context keeps what the run reads in memory for the next run on the
+    root_dir. Without one, everything is read from the root_dir's files."""
+    if context is None:
+        context = RunContext()
+    try:
+        return _update_files(root_dir, context)
+    except Exception:
+        context.clear()
+        raise
+
+
+def _update_files(root_dir: Path, context: RunContext) -> RunReport:
+    start_time = time.perf_counter()
+    timings = {}
+    # Before anything is read, so files edited during the run are run again.
+    states_before = run_snapshot.get_states(root_dir)
+    dotfile = context.read(
+        root_dir / dotfile_mod.PATH, lambda: dotfile_mod.read(root_dir)
+    )
+    assistant_config = context.read(
+        root_dir / assistant_config_mod.PATH,
+        lambda: assistant_config_mod.read_project_config(root_dir),
+    )
+    character_config = context.read(
+        root_dir / character_config_mod.PATH,
+        lambda: character_config_mod.read(root_dir),
+    )
 
     updating.update(root_dir=root_dir, dotfile=dotfile, config=assistant_config)
 
-    scripts = read_scripts(root_dir, dotfile)
+    file_states = context.read(
+        root_dir / file_states_mod.PATH,
+        lambda: file_states_mod.read(root_dir, dotfile),
+    )
+    scripts = read_scripts(root_dir, dotfile, file_states=file_states)
+    aseprite_metadata_cache = context.read(
+        root_dir / metadata_cache.PATH,
+        lambda: metadata_cache.read(root_dir, assistant_config),
+    )
+    if not aseprite_metadata_cache.is_for_config(assistant_config):
+        aseprite_metadata_cache = metadata_cache.read(root_dir, assistant_config)
     aseprites = read_aseprites(
-        root_dir, dotfile=dotfile, assistant_config=assistant_config
+        root_dir,
+        dotfile=dotfile,
+        assistant_config=assistant_config,
+        metadata_cache=aseprite_metadata_cache,
+        file_states=file_states,
     )
+    anims = get_anims(aseprites)
+    metadata_cache.save(root_dir, aseprite_metadata_cache)
+    context.saved(
+        root_dir / metadata_cache.PATH, aseprite_metadata_cache.get_next_run_cache()
+    )
+    step_time = _record_timing(timings, "read", start_time)
 
-    handle_warning(assistant_config=assistant_config, scripts=scripts)
-    handle_codegen(scripts)
-    handle_injection(root_dir=root_dir, scripts=scripts, anims=get_anims(aseprites))
+    injection_cache = context.read(
+        root_dir / injection_results.PATH, lambda: injection_results.read(root_dir)
+    )
+    warning_cache = context.read(
+        root_dir / warning_results.PATH, lambda: warning_results.read(root_dir)
+    )
+    assets = process_scripts(
+        root_dir=root_dir,
+        dotfile=dotfile,
+        assistant_config=assistant_config,
+        scripts=scripts,
+        anims=anims,
+        max_script_workers=get_max_script_workers(config=assistant_config),
+        injection_cache=injection_cache,
+        warning_cache=warning_cache,
+    )
+    context.saved(root_dir / injection_results.PATH, injection_cache)
+    context.saved(root_dir / warning_results.PATH, warning_cache)
+    step_time = _record_timing(timings, "process_scripts", step_time)
 
     save_scripts(root_dir, scripts)
+    step_time = _record_timing(timings, "save_scripts", step_time)
 
-    save_anims(
+    aseprite_export_cache = context.read(
+        root_dir / export_cache.PATH, lambda: export_cache.read(root_dir)
+    )
+    exported_paths = save_anims(
         root_dir,
         aseprite_path=get_aseprite_path(assistant_config),
         aseprites=aseprites,
@@ -80,15 +255,56 @@ def update_files(root_dir):
             scripts=scripts, character_config=character_config
         ),
         hurtboxes_enabled=get_hurtboxes_enabled(config=assistant_config),
+        max_export_workers=get_max_export_workers(config=assistant_config),
+        export_backend=get_export_backend(config=assistant_config),
+        export_cache=aseprite_export_cache,
     )
-    update_dotfile_after_saving(
-        now=datetime.datetime.now(), dotfile=dotfile, files=scripts + aseprites
+    export_cache.save(root_dir, aseprite_export_cache)
+    context.saved(root_dir / export_cache.PATH, aseprite_export_cache)
+    step_time = _record_timing(timings, "export", step_time)
+
+    written_paths = [
+        root_dir / paths.INJECT_FOLDER,  # Updated by updating.update
+        *(
+            root_dir / script.path
+            for script in scripts
+            if script.working_content != script.original_content
+        ),
+        *exported_paths,
+    ]
+    # Left out of the file states, so they're fresh next run.
+    edited_paths = run_snapshot.get_edited_paths(root_dir, states_before, written_paths)
+    file_states.update(
+        [file for file in scripts + aseprites if file.path not in edited_paths]
     )
+    file_states_mod.save(root_dir, file_states)
+    context.saved(root_dir / file_states_mod.PATH, file_states)
+    update_dotfile_after_saving(now=datetime.datetime.now(), dotfile=dotfile)
 
-    assets = get_required_assets(scripts)
-    save_assets(root_dir, assets)
+    created_asset_paths = save_assets(root_dir, assets)
 
     dotfile_mod.save_dotfile(root_dir, dotfile)
+    context.saved(root_dir / dotfile_mod.PATH, dotfile)
+    run_snapshot.save(
+        root_dir,
+        __version__,
+        states_before=states_before,
+        written_paths=[
+            *written_paths,
+            *created_asset_paths,
+            root_dir / dotfile_mod.PATH,
+        ],
+    )
+    _record_timing(timings, "finish", step_time)
+    _record_timing(timings, "total", start_time)
+    return RunReport(scripts=scripts, exported_paths=exported_paths, timings=timings)
+
+
+def _record_timing(timings: dict, step: str, step_start_time: float) -> float:
+    """Record how long the step took, and return the time it ended."""
+    now = time.perf_counter()
+    timings[step] = now - step_start_time
+    return now
 
 
 def get_root_dir(given_dir: Path) -> Path:
@@ -107,6 +323,34 @@ Files in current directory are: {file_names}"""
 
 
 if __name__ == "__main__":
+    # Needed for the script processing pool in the frozen exe.
+    multiprocessing.freeze_support()
     exe_dir = Path(__file__).parent
-    root_dir = Path(sys.argv[1])
-    main(exe_dir, root_dir)
+    args = sys.argv[1:]
+    if SERVE_FLAG in args:
+        args.remove(SERVE_FLAG)
+        port = server.DEFAULT_PORT
+        if PORT_FLAG in args:
+            port_index = args.index(PORT_FLAG)
+            port_args = args[port_index + 1 : port_index + 2]
+            del args[port_index : port_index + 2]
+            if not port_args:
+                print(f"{PORT_FLAG} needs a port.\n{SERVE_USAGE}")
+                sys.exit(2)
+            try:
+                port = server.parse_port(port_args[0])
+            except ValueError as error:
+                print(f"{error}\n{SERVE_USAGE}")
+                sys.exit(2)
+        if not args:
+            print(SERVE_USAGE)
+            sys.exit(2)
+        serve(exe_dir, [Path(arg) for arg in args], port=port)
+    elif WATCH_FLAG in args:
+        args.remove(WATCH_FLAG)
+        if not args:
+            print(WATCH_USAGE)
+            sys.exit(2)
+        watch(exe_dir, Path(args[0]))
+    else:
+        main(exe_dir, Path(args[0]))
@@ -0,0 +1,47 @@
+import os
+import typing
+from pathlib import Path
+
+T = typing.TypeVar("T")
+
+# A file's size and modified time, or None if it doesn't exist.
+StatKey = typing.Optional[typing.Tuple[int, int]]
+
+
+class RunContext:
+    def __init__(self):
+        """What runs on a root dir read from its files, like the dotfile, configs
+        and caches, kept in memory so a process that runs more than once,
+        in watch or serve mode, doesn't read them again on every run.
+        A value is read again if its file's size or modified time changed since
+        it was last read or saved, like when the user edits their config."""
+        self._values: typing.Dict[Path, typing.Tuple[StatKey, typing.Any]] = {}
+
+    def read(self, path: Path, read: typing.Callable[[], T]) -> T:
+        """The value last read or saved for the file, if the file hasn't changed
+        since. Otherwise the value from calling read."""
+        stat_key = _get_stat_key(path)
+        if path in self._values:
+            saved_stat_key, value = self._values[path]
+            if stat_key is not None and stat_key == saved_stat_key:
+                return value
+        value = read()
+        self._values[path] = (stat_key, value)
+        return value
+
+    def saved(self, path: Path, value: typing.Any):
+        """Call after the value is saved to the file, so the next run uses it
+        without reading the file again."""
+        self._values[path] = (_get_stat_key(path), value)
+
+    def clear(self):
+        """Call when a run fails, since it may have changed values it didn't save."""
+        self._values = {}
+
+
+def _get_stat_key(path: Path) -> StatKey:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
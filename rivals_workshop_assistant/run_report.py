@@ -0,0 +1,84 @@
+from pathlib import Path
+from typing import Dict, List
+
+from rivals_workshop_assistant.script_mod import Script
+from rivals_workshop_assistant.warning_handling.base import WARNING_PREFIX
+
+CHANGED_FILES_FIELD = "changed_files"
+WARNINGS_ADDED_FIELD = "warnings_added"
+EXPORTED_SPRITES_FIELD = "exported_sprites"
+TIMINGS_FIELD = "timings"
+
+FILE_FIELD = "file"
+LINE_FIELD = "line"
+WARNING_FIELD = "warning"
+
+
+class RunReport:
+    def __init__(
+        self,
+        scripts: List[Script] = None,
+        exported_paths: List[Path] = None,
+        timings: Dict[str, float] = None,
+    ):
+        """What a run did, for tools that run the assistant to show.
+        Timings are in seconds, by step."""
+        if scripts is None:
+            scripts = []
+        if exported_paths is None:
+            exported_paths = []
+        if timings is None:
+            timings = {}
+        self.scripts = scripts
+        self.exported_paths = exported_paths
+        self.timings = timings
+
+    def get_changed_scripts(self) -> List[Script]:
+        return [
+            script
+            for script in self.scripts
+            if script.working_content != script.original_content
+        ]
+
+    def get_warnings_added(self) -> List[dict]:
+        """The warnings on lines of changed scripts that didn't have them before.
+        Lines are 1-indexed, as editors show them."""
+        warnings = []
+        for script in self.get_changed_scripts():
+            original_lines = set(script.original_content.split("\n"))
+            for number, line in enumerate(script.working_content.split("\n")):
+                if WARNING_PREFIX not in line or line in original_lines:
+                    continue
+                for warning_text in line.split(WARNING_PREFIX)[1:]:
+                    warnings.append(
+                        {
+                            FILE_FIELD: script.path,
+                            LINE_FIELD: number + 1,
+                            WARNING_FIELD: warning_text,
+                        }
+                    )
+        return warnings
+
+    def to_json(self, root_dir: Path) -> dict:
+        """Paths are relative to the root dir."""
+        warnings_added = self.get_warnings_added()
+        for warning in warnings_added:
+            warning[FILE_FIELD] = _get_relative_path(root_dir, warning[FILE_FIELD])
+        return {
+            CHANGED_FILES_FIELD: [
+                _get_relative_path(root_dir, script.path)
+                for script in self.get_changed_scripts()
+            ],
+            WARNINGS_ADDED_FIELD: warnings_added,
+            EXPORTED_SPRITES_FIELD: [
+                _get_relative_path(root_dir, path) for path in self.exported_paths
+            ],
+            TIMINGS_FIELD: self.timings,
+        }
+
+
+def _get_relative_path(root_dir: Path, path: Path) -> str:
+    try:
+        return path.relative_to(root_dir).as_posix()
+    except ValueError:
+        return path.as_posix()
@@ -0,0 +1,199 @@
+"""A snapshot of the sizes and modified times of everything a run reads,
+so a run can be skipped when nothing changed since the last one."""
+
+import datetime
+import hashlib
+import os
+import time
+import typing
+from pathlib import Path
+from stat import S_ISDIR
+
+from rivals_workshop_assistant import (
+    info_files,
+    paths,
+    assistant_config_mod,
+    character_config_mod,
+    dotfile_mod,
+)
+
+FILENAME = ".snapshot"
+PATH = paths.ASSISTANT_FOLDER / FILENAME
+
+# Bump when the snapshot is taken differently.
+SNAPSHOT_VERSION = 2
+
+SNAPSHOT_FIELD = "snapshot"
+
+MISSING_STATE = "missing"
+FOLDER_STATE = "folder"
+
+WATCHED_PATHS = [
+    paths.SCRIPTS_FOLDER,
+    paths.ANIMS_FOLDER,
+    paths.SPRITES_FOLDER,
+    paths.INJECT_FOLDER,
+    paths.USER_INJECT_FOLDER,
+    assistant_config_mod.PATH,
+    Path(character_config_mod.PATH),
+    dotfile_mod.PATH,
+]
+
+
+def get_snapshot(
+    root_dir: Path, assistant_version: str, states: typing.Dict[str, str] = None
+) -> str:
+    """A hash of the states of every watched file and folder, see get_states.
+    The assistant version and the date are included, so a new assistant version
+    and the daily update check always get a full run."""
+    if states is None:
+        states = get_states(root_dir)
+    snapshot = hashlib.blake2b(digest_size=16)
+    _add_to_snapshot(snapshot, assistant_version)
+    _add_to_snapshot(snapshot, datetime.date.today().isoformat())
+    for name, state in sorted(states.items()):
+        _add_to_snapshot(snapshot, f"{name} {state}")
+    return snapshot.hexdigest()
+
+
+def get_states(root_dir: Path) -> typing.Dict[str, str]:
+    """The size and modified time of every watched file, keyed by its path
+    relative to the root_dir. Folders and missing paths have a state too,
+    so adding or removing them is a change."""
+    states = {}
+    for path in WATCHED_PATHS:
+        try:
+            stat = os.stat(root_dir / path)
+        except FileNotFoundError:
+            states[path.as_posix()] = MISSING_STATE
+            continue
+        _add_path_states(states, root_dir / path, path.as_posix(), stat)
+    return states
+
+
+def _add_path_states(
+    states: typing.Dict[str, str], path: Path, name: str, stat: os.stat_result
+):
+    if not S_ISDIR(stat.st_mode):
+        states[name] = f"{stat.st_size} {stat.st_mtime_ns}"
+        return
+    states[name] = FOLDER_STATE
+    with os.scandir(path) as entries:
+        for entry in entries:
+            _add_path_states(
+                states, Path(entry.path), f"{name}/{entry.name}", entry.stat()
+            )
+
+
+def wait_for_change(
+    root_dir: Path,
+    assistant_version: str,
+    snapshot: str,
+    poll_interval: float,
+    debounce_time: float,
+    sleep: typing.Callable[[float], None] = time.sleep,
+) -> str:
+    """Poll until the snapshot differs from the given one, then wait until it
+    stops changing for debounce_time, so a burst of saves is one change.
+    Returns the new snapshot."""
+    new_snapshot = snapshot
+    while new_snapshot == snapshot:
+        sleep(poll_interval)
+        new_snapshot = get_snapshot(root_dir, assistant_version)
+    while True:
+        sleep(debounce_time)
+        settled_snapshot = get_snapshot(root_dir, assistant_version)
+        if settled_snapshot == new_snapshot:
+            return new_snapshot
+        new_snapshot = settled_snapshot
+
+
+def _add_to_snapshot(snapshot, text: str):
+    snapshot.update(text.encode("UTF8", errors="surrogateescape") + b"\0")
+
+
+def is_unchanged(root_dir: Path, assistant_version: str) -> bool:
+    """Controller
+    If nothing the last run read has changed since then, a run would do nothing."""
+    return read(root_dir) == get_snapshot(root_dir, assistant_version)
+
+
+def read(root_dir: Path) -> typing.Optional[str]:
+    """Controller
+    The snapshot the last run saved, if any."""
+    content = info_files.read_versioned_json(root_dir / PATH, SNAPSHOT_VERSION)
+    if content is None:
+        return None
+    return content.get(SNAPSHOT_FIELD, None)
+
+
+def save(
+    root_dir: Path,
+    assistant_version: str,
+    states_before: typing.Dict[str, str] = None,
+    written_paths: typing.Iterable[Path] = (),
+) -> str:
+    """Controller
+    Call after a run has saved everything. Returns the saved snapshot.
+    states_before are the states from before the run read anything, and
+    written_paths the files and folders the run wrote. Files edited during the
+    run are saved with their state from before it, so the next run sees that
+    they changed, instead of taking them as already processed."""
+    states = get_states(root_dir)
+    if states_before is not None:
+        for name in _get_edited_names(root_dir, states_before, written_paths, states):
+            if name in states_before:
+                states[name] = states_before[name]
+            else:
+                del states[name]
+    snapshot = get_snapshot(root_dir, assistant_version, states)
+    info_files.save_versioned_json(
+        root_dir / PATH, SNAPSHOT_VERSION, {SNAPSHOT_FIELD: snapshot}
+    )
+    return snapshot
+
+
+def get_edited_paths(
+    root_dir: Path,
+    states_before: typing.Dict[str, str],
+    written_paths: typing.Iterable[Path] = (),
+) -> typing.Set[Path]:
+    """The watched files and folders that changed since states_before were
+    taken, other than the written_paths the run wrote."""
+    return {
+        root_dir / name
+        for name in _get_edited_names(
+            root_dir, states_before, written_paths, get_states(root_dir)
+        )
+    }
+
+
+def _get_edited_names(
+    root_dir: Path,
+    states_before: typing.Dict[str, str],
+    written_paths: typing.Iterable[Path],
+    states: typing.Dict[str, str],
+) -> typing.Set[str]:
+    written_names = {
+        _get_name(root_dir, written_path) for written_path in written_paths
+    }
+    return {
+        name
+        for name in set(states) | set(states_before)
+        if states.get(name) != states_before.get(name)
+        and not _is_written(name, written_names)
+    }
+
+
+def _is_written(name: str, written_names: typing.Set[str]) -> bool:
+    return any(
+        name == written_name or name.startswith(f"{written_name}/")
+        for written_name in written_names
+    )
+
+
+def _get_name(root_dir: Path, path: Path) -> str:
+    try:
+        return path.relative_to(root_dir).as_posix()
+    except ValueError:
+        return path.as_posix()
@@ -5,9 +5,11 @@ from typing import List
 
 from rivals_workshop_assistant.file_handling import (
     File,
+    _get_is_fresh,
     _get_modified_time,
 )
 from rivals_workshop_assistant.dotfile_mod import get_processed_time
+from rivals_workshop_assistant.file_states import FileStates
 
 
 class Script(File):
@@ -18,8 +20,9 @@ class Script(File):
         original_content: str = None,
         working_content: str = None,
         processed_time: datetime = None,
+        is_fresh: bool = None,
     ):
-        super().__init__(path, modified_time, processed_time)
+        super().__init__(path, modified_time, processed_time, is_fresh)
         self._original_content = original_content
         self._working_content = working_content
 
@@ -66,17 +69,23 @@ class Script(File):
         )
 
 
-def read_scripts(root_dir: Path, dotfile: dict) -> List[Script]:
-    """Returns all Scripts in the scripts directory."""
+def read_scripts(
+    root_dir: Path, dotfile: dict, file_states: FileStates = None
+) -> List[Script]:
+    """Returns all Scripts in the scripts directory.
+    If there are file states, they decide which scripts are fresh."""
     gml_paths = list((root_dir / "scripts").rglob("*.gml"))
 
     scripts = []
     for path in gml_paths:
-        script = Script(
-            path=path,
-            modified_time=_get_modified_time(path),
-            processed_time=get_processed_time(dotfile=dotfile, path=path),
-        )
+        if file_states is not None:
+            is_fresh = file_states.is_fresh(path)
+        else:
+            is_fresh = _get_is_fresh(
+                get_processed_time(dotfile=dotfile, path=path),
+                _get_modified_time(path),
+            )
+        script = Script(path=path, modified_time=None, is_fresh=is_fresh)
         scripts.append(script)
 
     return scripts
@@ -0,0 +1,155 @@
+"""Running every per-script step (warnings, codegen, injection, assets) on each
+script in one go, so scripts can be processed in parallel."""
+
+import typing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+from rivals_workshop_assistant.aseprite_handling import Anim
+from rivals_workshop_assistant.asset_handling import _get_required_assets_for_script
+from rivals_workshop_assistant.asset_handling.asset_types import Asset
+from rivals_workshop_assistant.code_generation import handle_codegen_for_script
+from rivals_workshop_assistant.injection.application import (
+    _apply_injection_to_script,
+    _get_anim_for_script,
+)
+from rivals_workshop_assistant.injection import result_cache as injection_results
+from rivals_workshop_assistant.injection.library import (
+    InjectionLibrary,
+    read_injection_library,
+)
+from rivals_workshop_assistant.injection.result_cache import InjectionResultCache
+from rivals_workshop_assistant.script_mod import Script
+from rivals_workshop_assistant.warning_handling import _apply_warnings_to_script
+from rivals_workshop_assistant.warning_handling import result_cache as warning_results
+from rivals_workshop_assistant.warning_handling.base import WarningType
+from rivals_workshop_assistant.warning_handling.result_cache import WarningResultCache
+from rivals_workshop_assistant.warning_handling.warnings import get_warning_types
+
+# Set in each worker process by _init_worker, so they're only sent once per worker.
+_warning_types: Set[WarningType] = set()
+_injection_library: InjectionLibrary = InjectionLibrary([])
+_injection_cache: InjectionResultCache = InjectionResultCache()
+_warning_cache: WarningResultCache = WarningResultCache()
+
+
+def process_scripts(
+    root_dir: Path,
+    dotfile: dict,
+    assistant_config: dict,
+    scripts: List[Script],
+    anims: Dict[str, Anim],
+    max_script_workers: int = 1,
+    injection_cache: InjectionResultCache = None,
+    warning_cache: WarningResultCache = None,
+) -> Set[Asset]:
+    """Controller
+    Applies warnings, codegen and injection to the scripts that need it,
+    and returns the assets the fresh scripts use.
+    With more than one worker, scripts are processed in a pool of processes.
+    Results are applied in script order either way, so the output is the same.
+    Each script's detected warnings and resolved injections are cached,
+    see WarningResultCache and InjectionResultCache. They're read unless given."""
+    warning_types = get_warning_types(assistant_config)
+    injection_library = read_injection_library(root_dir, dotfile)
+    if injection_cache is None:
+        injection_cache = injection_results.read(root_dir)
+    if warning_cache is None:
+        warning_cache = warning_results.read(root_dir)
+
+    script_jobs = []
+    for script in scripts:
+        anim = _get_anim_for_script(script, anims)
+        if script.is_fresh or (anim is not None and anim.is_fresh):
+            script_jobs.append((script, anim))
+    if not script_jobs:
+        return set()
+
+    if max_script_workers > 1 and len(script_jobs) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(max_script_workers, len(script_jobs)),
+            initializer=_init_worker,
+            initargs=(
+                warning_types,
+                injection_library,
+                injection_cache,
+                warning_cache,
+            ),
+        ) as executor:
+            results = list(executor.map(_process_script_job, script_jobs))
+    else:
+        _init_worker(warning_types, injection_library, injection_cache, warning_cache)
+        results = [_process_script_job(script_job) for script_job in script_jobs]
+
+    required_assets = set()
+    for (script, _), (working_content, assets, cache_entries) in zip(
+        script_jobs, results
+    ):
+        script.working_content = working_content
+        required_assets.update(assets)
+        for cache, cache_entry in zip((injection_cache, warning_cache), cache_entries):
+            if cache_entry is not None:
+                cache.entries[script.path.as_posix()] = cache_entry
+    injection_results.save(root_dir, injection_cache)
+    warning_results.save(root_dir, warning_cache)
+    return required_assets
+
+
+def _init_worker(
+    warning_types: Set[WarningType],
+    injection_library: InjectionLibrary,
+    injection_cache: InjectionResultCache,
+    warning_cache: WarningResultCache,
+):
+    global _warning_types, _injection_library, _injection_cache, _warning_cache
+    _warning_types = warning_types
+    _injection_library = injection_library
+    _injection_cache = injection_cache
+    _warning_cache = warning_cache
+
+
+def _process_script_job(
+    script_job: Tuple[Script, typing.Optional[Anim]],
+) -> Tuple[str, Set[Asset], Tuple[typing.Optional[dict], typing.Optional[dict]]]:
+    """Also returns the script's injection and warning cache entries, since a worker
+    process's changes to its copies of the caches don't reach the main process."""
+    script, anim = script_job
+    working_content, assets = process_script(
+        script=script,
+        anim=anim,
+        warning_types=_warning_types,
+        injection_library=_injection_library,
+        injection_cache=_injection_cache,
+        warning_cache=_warning_cache,
+    )
+    path = script.path.as_posix()
+    cache_entries = (
+        _injection_cache.entries.get(path, None),
+        _warning_cache.entries.get(path, None),
+    )
+    return working_content, assets, cache_entries
+
+
+def process_script(
+    script: Script,
+    anim: typing.Optional[Anim],
+    warning_types: Set[WarningType],
+    injection_library: InjectionLibrary,
+    injection_cache: InjectionResultCache = None,
+    warning_cache: WarningResultCache = None,
+) -> Tuple[str, Set[Asset]]:
+    """The script's new content and the assets it uses, in the same order as the
+    separate handle_warning, handle_codegen, handle_injection and
+    get_required_assets steps."""
+    if script.is_fresh:
+        _apply_warnings_to_script(script, warning_types, warning_cache)
+        script.working_content = handle_codegen_for_script(script.working_content)
+    if script.is_fresh or (anim is not None and anim.is_fresh):
+        _apply_injection_to_script(script, injection_library, anim, injection_cache)
+
+    if script.is_fresh:
+        assets = _get_required_assets_for_script(script)
+    else:
+        assets = set()
+    return script.working_content, assets
@@ -0,0 +1,158 @@
+"""A local server, so editor plugins can have one running assistant process
+their characters, instead of starting the assistant on every save.
+
+Clients connect over TCP on localhost and send requests as lines of json.
+Each request gets one line of json back.
+    {"command": "process_root", "root": "C:/characters/my_char"}
+    {"command": "process_file", "path": "C:/characters/my_char/scripts/init.gml"}
+process_file processes the whole character the file is in, like process_root.
+Only files that changed since the last run are processed again either way.
+The server only processes the character folders it was started with, since any
+local process can connect to it.
+A successful response has "ok": true, the fields of a RunReport, and "seconds",
+the time the request took. A failed one has "ok": false and an "error"."""
+
+import json
+import socketserver
+import threading
+import time
+import traceback
+import typing
+from pathlib import Path
+
+from rivals_workshop_assistant import character_config_mod
+
+HOST = "127.0.0.1"
+DEFAULT_PORT = 47385
+MIN_PORT = 1
+MAX_PORT = 65535
+
+COMMAND_FIELD = "command"
+ROOT_FIELD = "root"
+PATH_FIELD = "path"
+OK_FIELD = "ok"
+ERROR_FIELD = "error"
+SECONDS_FIELD = "seconds"
+
+PROCESS_ROOT_COMMAND = "process_root"
+PROCESS_FILE_COMMAND = "process_file"
+
+# Processes a character's root dir, returning a RunReport's json,
+# or None if another instance is already running on it.
+ProcessRoot = typing.Callable[[Path], typing.Optional[dict]]
+
+# Requests are handled one at a time, since runs share the in-memory state kept
+# for each root, and the injection libraries.
+_process_lock = threading.Lock()
+
+
+def serve(
+    process_root: ProcessRoot, root_dirs: typing.List[Path], port: int = DEFAULT_PORT
+):
+    """Controller
+    Serves requests on the root_dirs until interrupted."""
+    allowed_root_dirs = get_allowed_root_dirs(root_dirs)
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for request_line in self.rfile:
+                if not request_line.strip():
+                    continue
+                response = handle_request(request_line, process_root, allowed_root_dirs)
+                self.wfile.write(json.dumps(response).encode("UTF8") + b"\n")
+                self.wfile.flush()
+
+    with socketserver.ThreadingTCPServer((HOST, port), RequestHandler) as server:
+        server.daemon_threads = True
+        print(f"Serving on {HOST}:{port}. Press Ctrl+C to stop.")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("Stopped serving.")
+
+
+def parse_port(port_string: str) -> int:
+    """Raises ValueError if the string isn't a port number."""
+    try:
+        port = int(port_string)
+    except ValueError:
+        raise ValueError(f"The port {port_string} isn't a number.") from None
+    if not MIN_PORT <= port <= MAX_PORT:
+        raise ValueError(f"The port {port} isn't from {MIN_PORT} to {MAX_PORT}.")
+    return port
+
+
+def get_allowed_root_dirs(root_dirs: typing.List[Path]) -> typing.Set[Path]:
+    return {root_dir.resolve() for root_dir in root_dirs}
+
+
+def handle_request(
+    request_line: bytes,
+    process_root: ProcessRoot,
+    allowed_root_dirs: typing.Set[Path],
+) -> dict:
+    """allowed_root_dirs are the resolved character folders requests may process,
+    see get_allowed_root_dirs."""
+    start_time = time.perf_counter()
+    try:
+        request = json.loads(request_line)
+    except ValueError:
+        return _make_error_response("The request isn't valid json.")
+    if not isinstance(request, dict):
+        return _make_error_response("The request isn't a json object.")
+
+    command = request.get(COMMAND_FIELD, None)
+    if command == PROCESS_ROOT_COMMAND and ROOT_FIELD in request:
+        root_dir = Path(request[ROOT_FIELD])
+    elif command == PROCESS_FILE_COMMAND and PATH_FIELD in request:
+        path = Path(request[PATH_FIELD]).resolve()
+        if not any(root_dir in path.parents for root_dir in allowed_root_dirs):
+            return _make_error_response(
+                f"{request[PATH_FIELD]} isn't in one of the character folders "
+                "the server was started with."
+            )
+        root_dir = get_root_dir_of_file(path)
+        if root_dir is None:
+            return _make_error_response(
+                f"{request[PATH_FIELD]} isn't in a character folder with a "
+                f"{character_config_mod.FILENAME}."
+            )
+    else:
+        return _make_error_response(
+            f'Requests need a "{COMMAND_FIELD}" of "{PROCESS_ROOT_COMMAND}" '
+            f'with a "{ROOT_FIELD}", or "{PROCESS_FILE_COMMAND}" '
+            f'with a "{PATH_FIELD}".'
+        )
+    if root_dir.resolve() not in allowed_root_dirs:
+        return _make_error_response(
+            f"{root_dir} isn't one of the character folders the server was "
+            "started with."
+        )
+
+    try:
+        with _process_lock:
+            report = process_root(root_dir)
+    except Exception as exception:
+        traceback.print_exc()
+        return _make_error_response(f"{type(exception).__name__}: {exception}")
+    if report is None:
+        return _make_error_response(
+            "Another instance of the assistant is already running on this character."
+        )
+    return {
+        OK_FIELD: True,
+        **report,
+        SECONDS_FIELD: time.perf_counter() - start_time,
+    }
+
+
+def get_root_dir_of_file(path: Path) -> typing.Optional[Path]:
+    """The closest folder containing the file that has a character config."""
+    for folder in path.parents:
+        if (folder / character_config_mod.FILENAME).is_file():
+            return folder
+    return None
+
+
+def _make_error_response(error: str) -> dict:
+    return {OK_FIELD: False, ERROR_FIELD: error}
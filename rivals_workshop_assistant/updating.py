@@ -9,7 +9,6 @@ import typing
 import zipfile
 from pathlib import Path
 from typing import List
-import requests
 
 import rivals_workshop_assistant.paths
 from rivals_workshop_assistant import paths as paths, assistant_config_mod
@@ -23,6 +22,13 @@ from rivals_workshop_assistant.dotfile_mod import (
 )
 
 
+def _get(url: str):
+    # requests is slow to import, and only needed when checking for updates.
+    import requests
+
+    return requests.get(url)
+
+
 @dataclasses.dataclass
 class Version:
     major: int = 0
@@ -161,7 +167,7 @@ class Updater(abc.ABC):
         raise NotImplementedError
 
     def get_releases(self):
-        release_dicts = requests.get(
+        release_dicts = _get(
             f"https://api.github.com/repos"
             f"/{paths.REPO_OWNER}/{self.REPO_NAME}/releases"
         ).json()
@@ -219,7 +225,7 @@ class AssistantUpdater(Updater):
 
         with tempfile.TemporaryDirectory() as tmp:
             request = release.get_asset_url(paths.ASSISTANT_EXE_NAME)
-            response = requests.get(request)
+            response = _get(request)
             tmp_exe_path = Path(tmp) / paths.ASSISTANT_TMP_EXE_NAME
             with open(tmp_exe_path, mode="wb") as exe_file:
                 exe_file.write(response.content)
@@ -333,7 +339,7 @@ def _delete_old_library_release(root_dir: Path):
 def _download_and_unzip_library_release(root_dir: Path, release: Release):
     """Controller"""
     with tempfile.TemporaryDirectory() as tmp:
-        response = requests.get(release.download_url)
+        response = _get(release.download_url)
         zipped_release = zipfile.ZipFile(io.BytesIO(response.content))
         zipped_release.extractall(path=tmp)
 
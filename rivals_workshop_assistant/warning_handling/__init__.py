@@ -1,27 +1,97 @@
 import re
 from typing import List, Set
 
+from rivals_workshop_assistant.file_handling import get_text_hash
 from rivals_workshop_assistant.script_mod import Script
 from rivals_workshop_assistant.warning_handling.warnings import get_warning_types
 from rivals_workshop_assistant.warning_handling.base import WARNING_PREFIX, WarningType
+from rivals_workshop_assistant.warning_handling.result_cache import (
+    Detection,
+    WarningResultCache,
+)
 
 
-def handle_warning(assistant_config: dict, scripts: List[Script]):
+def handle_warning(
+    assistant_config: dict,
+    scripts: List[Script],
+    warning_cache: WarningResultCache = None,
+):
     warning_types = get_warning_types(assistant_config)
     for script in scripts:
         if script.is_fresh:
-            _apply_warnings_to_script(script, warning_types)
+            _apply_warnings_to_script(script, warning_types, warning_cache)
 
 
-def _apply_warnings_to_script(script: Script, warning_types: Set[WarningType]):
-    script.working_content = _remove_warnings(script.working_content)
+def _apply_warnings_to_script(
+    script: Script,
+    warning_types: Set[WarningType],
+    warning_cache: WarningResultCache = None,
+):
+    """Replace the script's old warnings with new ones, in a single pass over it.
+    Every warning type checks each line, and a line's warnings are written
+    in the order of the warning types' names.
+    With a cache, the lines warnings were detected on are reused while neither
+    the script's code nor the enabled warning types change."""
+    warning_types_by_name = {
+        type(warning_type).__name__: warning_type for warning_type in warning_types
+    }
+    warning_names = sorted(warning_types_by_name)
+
+    lines = script.working_content.split("\n")
+    if WARNING_PREFIX in script.working_content:
+        lines = [line.split(WARNING_PREFIX, 1)[0] for line in lines]
+
+    detections = None
+    if warning_cache is not None:
+        content_hash = get_text_hash("\n".join(lines))
+        detections = warning_cache.get(script.path, content_hash, warning_names)
+    if detections is None:
+        detections = _get_detections(
+            script,
+            [warning_types_by_name[name] for name in warning_names],
+            lines,
+        )
+        if warning_cache is not None:
+            warning_cache.store(script.path, content_hash, warning_names, detections)
+
+    for number, names in detections:
+        lines[number] += "".join(
+            warning_types_by_name[name].get_warning_text() for name in names
+        )
+    script.working_content = "\n".join(lines)
+
+
+def _get_detections(
+    script: Script, warning_types: List[WarningType], lines: List[str]
+) -> List[Detection]:
+    """The lines of the script, without its warnings, that each warning type
+    is detected on."""
+    line_checkers = []
     for warning_type in warning_types:
-        _apply_warning_to_script(script, warning_type)
+        line_checker = warning_type.get_line_checker(script)
+        if line_checker is not None:
+            line_checkers.append((line_checker, type(warning_type).__name__))
+    if not line_checkers:
+        return []
 
+    if _OTHER_LINE_BREAKS.search(script.working_content):
+        # Warnings are detected on lines as str.splitlines() splits them.
+        checked_lines = "\n".join(lines).splitlines()
+    else:
+        checked_lines = lines
+
+    detections = []
+    for number, line in enumerate(checked_lines):
+        # Every checker sees every line, since some keep track of earlier lines.
+        names = [name for line_checker, name in line_checkers if line_checker(line)]
+        if names and number < len(lines):
+            detections.append((number, names))
+    return detections
 
-def _remove_warnings(script_content: str) -> str:
-    return re.sub(pattern=fr"{WARNING_PREFIX}.*(\n|$)", repl="", string=script_content)
 
+# Line breaks other than \n that str.splitlines() splits on.
+_OTHER_LINE_BREAKS = re.compile("[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
 
-def _apply_warning_to_script(script: Script, warning_type: WarningType):
-    warning_type.apply(script)
+
+def _remove_warnings(script_content: str) -> str:
+    return re.sub(pattern=fr"{WARNING_PREFIX}.*", repl="", string=script_content)
@@ -1,4 +1,5 @@
 import abc
+import typing
 from pathlib import Path
 from typing import List
 
@@ -30,13 +31,30 @@ class WarningType(abc.ABC):
         ]
 
     def get_detection_lines(self, script: Script):
-        detection_lines = []
-        for number, line in enumerate(script.working_content.splitlines()):
-            if not is_line_suppressed(line) and self._should_warn_for_line(
+        line_checker = self.get_line_checker(script)
+        if line_checker is None:
+            return []
+        return [
+            number
+            for number, line in enumerate(script.working_content.splitlines())
+            if line_checker(line)
+        ]
+
+    def get_line_checker(
+        self, script: Script
+    ) -> typing.Optional[typing.Callable[[str], bool]]:
+        """A function to call on each line of the script in order,
+        which returns if the line gets the warning.
+        None if the warning can't apply to the script at all."""
+        if not self._should_apply_to_script(script):
+            return None
+
+        def line_checker(line: str) -> bool:
+            return not is_line_suppressed(line) and self._should_warn_for_line(
                 script, line
-            ):
-                detection_lines.append(number)
-        return detection_lines
+            )
+
+        return line_checker
 
     def write_warning(self, detection_lines: List[int], gml: str) -> str:
         lines = gml.split("\n")
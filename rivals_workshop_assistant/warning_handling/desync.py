@@ -1,5 +1,5 @@
 import re
-from typing import List
+from typing import Set
 
 from rivals_workshop_assistant.script_mod import Script
 from rivals_workshop_assistant.warning_handling.base import (
@@ -8,6 +8,10 @@ from rivals_workshop_assistant.warning_handling.base import (
     is_draw_script,
 )
 
+_LOCAL_VAR_PATTERN = re.compile(r"(?<=var )\w+")
+# A variable set at the start of a line, capturing its name.
+_ASSIGNMENT_PATTERN = re.compile(r"^\s*(\w+)\s*(=|\+=|-=|\*=|\/=)\s*\S")
+
 
 class ObjectVarSetInDrawScript(WarningType):
     warning_content = (
@@ -15,25 +19,30 @@ class ObjectVarSetInDrawScript(WarningType):
         " Consider using `var` or creating constants in `init.gml`."
     )
 
-    def get_detection_lines(self, script: Script):
+    def get_line_checker(self, script: Script):
         if not is_draw_script(script.path):
-            return []
-        detection_lines = []
-        local_vars = []
-        for number, line in enumerate(script.working_content.splitlines()):
-            local_vars_in_line = re.findall(pattern=r"(?<=var )\w+", string=line)
-            local_vars += local_vars_in_line
-
-            if not is_line_suppressed(line) and self._should_warn_for_line(
+            return None
+        # "var" itself is in the set, so declarations aren't warned about.
+        local_vars = {"var"}
+
+        def line_checker(line: str) -> bool:
+            local_vars.update(_LOCAL_VAR_PATTERN.findall(line))
+
+            return not is_line_suppressed(line) and self._should_warn_for_line(
                 local_vars=local_vars, line=line
-            ):
-                detection_lines.append(number)
-        return detection_lines
-
-    def _should_warn_for_line(self, local_vars: List[str], line: str) -> bool:
-        # A variable is set without 'var', and it is not in the list of local_vars
-        pattern = fr'^\s*(?!(?:{"|".join(["var"] + local_vars)}))\w+\s*(=|\+=|-=|\*=|\/=)\s*\S'
-        return re.search(pattern=pattern, string=line) is not None
+            )
+
+        return line_checker
+
+    def _should_warn_for_line(self, local_vars: Set[str], line: str) -> bool:
+        # A variable is set without 'var', and it is not one of the local_vars.
+        # A name starting with a local var's name counts as that local var,
+        # so with a local `a`, setting `ab` isn't warned about.
+        match = _ASSIGNMENT_PATTERN.match(line)
+        if match is None:
+            return False
+        name = match.group(1)
+        return not any(name[:end] in local_vars for end in range(1, len(name) + 1))
 
 
 class UnsafeCameraReadX(WarningType):
@@ -9,19 +9,22 @@ from rivals_workshop_assistant.warning_handling.base import (
 
 
 class ABCHitpauseWarning(WarningType, abc.ABC):
-    def get_detection_lines(self, script: Script):
-        detection_lines = []
+    def get_line_checker(self, script: Script):
+        if not self._should_apply_to_script(script):
+            return None
         guard_seen = False
-        for number, line in enumerate(script.working_content.splitlines()):
+
+        def line_checker(line: str) -> bool:
+            nonlocal guard_seen
             if _is_hitpause_guard(line):
                 guard_seen = True
-            if (
+            return (
                 not guard_seen
                 and not is_line_suppressed(line)
                 and self._should_warn_for_line(script=script, line=line)
-            ):
-                detection_lines.append(number)
-        return detection_lines
+            )
+
+        return line_checker
 
 
 NOT_HITPAUSE = "!hitpause"
@@ -0,0 +1,82 @@
+import typing
+from pathlib import Path
+from typing import List, Tuple
+
+from rivals_workshop_assistant import info_files
+from rivals_workshop_assistant.paths import ASSISTANT_FOLDER
+
+FILENAME = ".warning_results"
+PATH = ASSISTANT_FOLDER / FILENAME
+
+# Bump when entries change shape, or when a warning type's detection changes.
+CACHE_VERSION = 1
+
+ENTRIES_FIELD = "entries"
+
+CONTENT_HASH_FIELD = "content_hash"
+WARNING_NAMES_FIELD = "warnings"
+DETECTIONS_FIELD = "detections"
+
+# A line number, and the names of the warning types detected on it.
+Detection = Tuple[int, List[str]]
+
+
+class WarningResultCache:
+    def __init__(self, entries: dict = None):
+        """The warnings detected in each script in previous runs,
+        keyed by script path.
+        An entry is only valid for the same script code, without its warnings,
+        and the same enabled warning types."""
+        if entries is None:
+            entries = {}
+        self.entries = entries
+
+    def get(
+        self, path: Path, content_hash: str, warning_names: List[str]
+    ) -> typing.Optional[List[Detection]]:
+        """The lines the warnings were detected on,
+        if neither the script's code nor the enabled warnings have changed."""
+        entry = self.entries.get(path.as_posix(), None)
+        if (
+            entry is None
+            or entry[CONTENT_HASH_FIELD] != content_hash
+            or entry[WARNING_NAMES_FIELD] != warning_names
+        ):
+            return None
+        return [(number, names) for number, names in entry[DETECTIONS_FIELD]]
+
+    def store(
+        self,
+        path: Path,
+        content_hash: str,
+        warning_names: List[str],
+        detections: List[Detection],
+    ):
+        self.entries[path.as_posix()] = {
+            CONTENT_HASH_FIELD: content_hash,
+            WARNING_NAMES_FIELD: warning_names,
+            DETECTIONS_FIELD: [[number, names] for number, names in detections],
+        }
+
+    def to_json(self) -> dict:
+        """Only scripts that still exist are kept."""
+        return {
+            ENTRIES_FIELD: {
+                path: entry
+                for path, entry in self.entries.items()
+                if Path(path).exists()
+            },
+        }
+
+
+def read(root_dir: Path) -> WarningResultCache:
+    """Controller"""
+    content = info_files.read_versioned_json(root_dir / PATH, CACHE_VERSION)
+    if content is None:
+        return WarningResultCache()
+    return WarningResultCache(entries=content.get(ENTRIES_FIELD, {}))
+
+
+def save(root_dir: Path, cache: WarningResultCache):
+    """Controller"""
+    info_files.save_versioned_json(root_dir / PATH, CACHE_VERSION, cache.to_json())
@@ -1,7 +1,11 @@
+import os
+
 import pytest
 from configparser import ConfigParser
 from pathlib import Path
 
+from testfixtures import TempDirectory
+
 import rivals_workshop_assistant.assistant_config_mod
 import rivals_workshop_assistant.character_config_mod
 from rivals_workshop_assistant.aseprite_handling import (
@@ -10,10 +14,25 @@ from rivals_workshop_assistant.aseprite_handling import (
     AsepriteTag,
     Anim,
     Window,
+    save_anims,
+    read_aseprite,
+    metadata_cache,
+    get_anims,
+)
+from rivals_workshop_assistant.aseprite_handling._aseprite_loading import (
+    RawAsepriteFile,
+    CelChunk,
+    CelExtraChunk,
+    MaskChunk,
+    Header,
+    CHUNK_HEADER_SIZE,
+    read_metadata_bytes,
 )
+from rivals_workshop_assistant.assistant_config_mod import ANIM_TAG_COLOR_FIELD
 from tests.testing_helpers import (
     make_script,
     make_time,
+    supply_aseprites,
 )
 from rivals_workshop_assistant import character_config_mod
 
@@ -120,3 +139,255 @@ def test_aseprite_anims(tags, expected):
     sut = make_fake_aseprite(tags=tags, anim_tag_color="red", window_tag_color="orange")
 
     assert sut.content.anims == expected
+
+
+def test_save_anims__reports_all_failures(capsys):
+    aseprites = [
+        make_fake_aseprite(name="first", path=Path("first.aseprite")),
+        make_fake_aseprite(name="second", path=Path("second.aseprite")),
+    ]
+    for aseprite in aseprites:
+        aseprite.is_fresh = True
+
+    with TempDirectory() as tmp:
+        save_anims(
+            root_dir=Path(tmp.path),
+            aseprite_path=Path(tmp.path) / "missing_aseprite.exe",
+            aseprites=aseprites,
+            has_small_sprites=False,
+            max_export_workers=2,
+        )
+
+    output = capsys.readouterr().out
+    assert "Failed to export 2 aseprite file(s)" in output
+    assert output.index("first.aseprite") < output.index("second.aseprite")
+
+
+def test_anim_get_export_jobs():
+    anim = Anim(name="bair", start=2, end=4)
+
+    with TempDirectory() as tmp:
+        root_dir = Path(tmp.path)
+        jobs = anim.get_export_jobs(
+            root_dir=root_dir,
+            aseprite_file_path=root_dir / "anims" / "bair.aseprite",
+            has_small_sprites=True,
+            hurtboxes_enabled=True,
+        )
+
+    assert [job.to_line() for job in jobs] == [
+        f"anim\t3\t5\t1\t{root_dir / 'sprites' / 'bair_strip3.png'}",
+        f"hurtbox\t3\t5\t2\t{root_dir / 'sprites' / 'bair_hurt_strip3.png'}",
+    ]
+
+
+def test_raw_aseprite_file__metadata_only_matches_full_parse():
+    path = Path("tests/assets/sprites/nair.aseprite")
+
+    full = RawAsepriteFile.from_path(path)
+    metadata = RawAsepriteFile.from_path(path, metadata_only=True)
+
+    assert metadata.get_num_frames() == full.get_num_frames() == 3
+    assert [vars(tag) for tag in metadata.get_tags()] == [
+        vars(tag) for tag in full.get_tags()
+    ]
+    assert [layer.name for layer in metadata.layers] == [
+        layer.name for layer in full.layers
+    ]
+    assert not any(
+        isinstance(chunk, CelChunk)
+        for frame in metadata.frames
+        for chunk in frame.chunks
+    )
+
+
+def test_read_metadata_bytes__skips_pixel_data():
+    path = Path("tests/assets/sprites/nair.aseprite")
+    full = RawAsepriteFile.from_path(path)
+    frame_0_end = Header.header_size + full.frames[0].size
+
+    with open(path, "rb") as f:
+        metadata_bytes = read_metadata_bytes(f)
+
+    pixel_chunks = [
+        chunk
+        for chunk in full.frames[0].chunks
+        if isinstance(chunk, (CelChunk, CelExtraChunk, MaskChunk))
+    ]
+    assert pixel_chunks
+    assert len(metadata_bytes) == frame_0_end - sum(
+        chunk.chunk_size - CHUNK_HEADER_SIZE for chunk in pixel_chunks
+    )
+
+
+def test_metadata_cache__unchanged_file_is_not_parsed(monkeypatch):
+    with TempDirectory() as tmp:
+        root_dir = Path(tmp.path)
+        path = supply_aseprites(tmp).path
+
+        cache = metadata_cache.read(root_dir, assistant_config={})
+        parsed = read_aseprite(path, {}, {}, metadata_cache=cache).content
+        metadata_cache.save(root_dir, cache)
+
+        def fail_parsing(*args, **kwargs):
+            assert False, "aseprite was parsed again"
+
+        monkeypatch.setattr(AsepriteData, "from_path", fail_parsing)
+        cache = metadata_cache.read(root_dir, assistant_config={})
+        cached = read_aseprite(path, {}, {}, metadata_cache=cache).content
+
+    assert cached.num_frames == parsed.num_frames
+    assert [vars(tag) for tag in cached.tags] == [vars(tag) for tag in parsed.tags]
+    assert cached.anims == parsed.anims
+    assert [[vars(window) for window in anim.windows] for anim in cached.anims] == [
+        [vars(window) for window in anim.windows] for anim in parsed.anims
+    ]
+
+
+def test_metadata_cache__tag_color_change_invalidates():
+    with TempDirectory() as tmp:
+        root_dir = Path(tmp.path)
+        path = supply_aseprites(tmp).path
+
+        cache = metadata_cache.read(root_dir, assistant_config={})
+        read_aseprite(path, {}, {}, metadata_cache=cache).content
+        metadata_cache.save(root_dir, cache)
+
+        same_config_cache = metadata_cache.read(root_dir, assistant_config={})
+        new_config_cache = metadata_cache.read(
+            root_dir, assistant_config={ANIM_TAG_COLOR_FIELD: "green"}
+        )
+
+        assert same_config_cache.get(path) is not None
+        assert new_config_cache.get(path) is None
+
+
+def test_metadata_cache__next_run_cache():
+    with TempDirectory() as tmp:
+        root_dir = Path(tmp.path)
+        path = supply_aseprites(tmp).path
+
+        cache = metadata_cache.read(root_dir, assistant_config={})
+        read_aseprite(path, {}, {}, metadata_cache=cache).content
+        next_run_cache = cache.get_next_run_cache()
+
+        assert next_run_cache.get(path) is not None
+        assert next_run_cache.is_for_config({})
+        assert not next_run_cache.is_for_config({ANIM_TAG_COLOR_FIELD: "green"})
+
+
+def test_metadata_cache__store_doesnt_hash(monkeypatch):
+    with TempDirectory() as tmp:
+        path = supply_aseprites(tmp).path
+
+        def fail_hashing(path):
+            assert False, "aseprite was hashed"
+
+        monkeypatch.setattr(metadata_cache, "get_content_hash", fail_hashing)
+        cache = metadata_cache.read(Path(tmp.path), assistant_config={})
+        cache.store(path, {"some": "data"})
+        cache.entries = cache.new_entries
+
+        assert cache.get(path) == {"some": "data"}
+
+
+def test_metadata_cache__touched_file_is_hashed_lazily():
+    def touch(path):
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    with TempDirectory() as tmp:
+        path = supply_aseprites(tmp).path
+        cache = metadata_cache.read(Path(tmp.path), assistant_config={})
+        cache.store(path, {"some": "data"})
+        cache.entries = cache.new_entries
+
+        touch(path)
+        # There's no hash to compare to until the file has been touched once.
+        assert cache.get(path) is None
+        cache.store(path, {"some": "data"})
+        cache.entries = cache.new_entries
+
+        touch(path)
+        assert cache.get(path) == {"some": "data"}
+
+        path.write_bytes(path.read_bytes()[:-1] + b"x")
+        touch(path)
+        assert cache.get(path) is None
+
+
+def test_raw_aseprite_file__cel_data_is_not_copied():
+    raw = RawAsepriteFile.from_path(Path("tests/assets/sprites/nair.aseprite"))
+    cel = next(chunk for chunk in raw.frames[0].chunks if isinstance(chunk, CelChunk))
+
+    assert isinstance(cel.data["data"], memoryview)
+    assert cel.data["data"].obj is raw.data.obj
+    assert len(cel.get_pixel_bytes()) == cel.data["width"] * cel.data["height"] * 4
+
+
+def test_raw_aseprite_file__close_unmaps_file():
+    with RawAsepriteFile.from_path(Path("tests/assets/sprites/nair.aseprite")) as raw:
+        mapped = raw.data.obj
+        cel = next(
+            chunk for chunk in raw.frames[0].chunks if isinstance(chunk, CelChunk)
+        )
+        cel.get_pixel_bytes()
+
+    assert mapped.closed
+    with pytest.raises(ValueError):
+        bytes(cel.data["data"])
+
+
+def test_raw_aseprite_file__close_with_mask():
+    path = Path("tests/assets/sprites/1frame_mask.aseprite")
+    with RawAsepriteFile.from_path(path) as raw:
+        mapped = raw.data.obj
+        mask = next(
+            chunk for chunk in raw.frames[0].chunks if isinstance(chunk, MaskChunk)
+        )
+
+    assert mapped.closed
+    assert mask.bitmap == bytes([0b11000000, 0b01000000])
+
+
+def test_cel_chunk__pixel_array():
+    raw = RawAsepriteFile.from_path(Path("tests/assets/sprites/1frame.aseprite"))
+    cel = next(chunk for chunk in raw.frames[0].chunks if isinstance(chunk, CelChunk))
+
+    height, width, channels = cel.pixel_shape
+    pixels = cel.get_pixel_array()
+
+    assert (height, width, channels) == (2, 2, 4)
+    assert len(pixels) == height * width * channels
+    assert cel.get_pixel_bytes() is cel.get_pixel_bytes()
+
+
+def test_get_anims__indexed_by_name_and_warns_on_duplicates(capsys):
+    def make_aseprite_with_anims(path: Path, anims):
+        return Aseprite(
+            path=path,
+            modified_time=make_time(),
+            anim_tag_color="green",
+            window_tag_color="orange",
+            content=AsepriteData(
+                name=path.stem,
+                num_frames=6,
+                anim_tag_color="green",
+                window_tag_color="orange",
+                anims=anims,
+            ),
+        )
+
+    nair = Anim(name="nair", start=0, end=2)
+    bair = Anim(name="bair", start=3, end=5)
+    other_nair = Anim(name="nair", start=0, end=1)
+    aseprites = [
+        make_aseprite_with_anims(Path("attacks.aseprite"), [nair, bair]),
+        make_aseprite_with_anims(Path("vfx/nair.aseprite"), [other_nair]),
+    ]
+
+    anims = get_anims(aseprites)
+
+    assert anims == {"nair": nair, "bair": bair}
+    assert anims["nair"] is nair
+    assert "WARN: There are 2 anims named nair" in capsys.readouterr().out
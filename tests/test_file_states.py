@@ -0,0 +1,87 @@
+import os
+from pathlib import Path
+
+from testfixtures import TempDirectory
+
+from rivals_workshop_assistant import file_states as src
+from rivals_workshop_assistant.dotfile_mod import (
+    PROCESSED_TIME_FIELD,
+    SEEN_FILES_FIELD,
+)
+from rivals_workshop_assistant.script_mod import read_scripts
+from tests.testing_helpers import (
+    make_time,
+    TEST_DATETIME_STRING,
+    TEST_LATER_DATETIME_STRING,
+)
+
+
+def test_file_states__unseen_file_is_fresh():
+    with TempDirectory() as tmp:
+        path = Path(tmp.write("scripts/a.gml", b"content"))
+
+        assert src.FileStates().is_fresh(path)
+
+
+def test_file_states__unchanged_file_is_not_fresh():
+    with TempDirectory() as tmp:
+        path = Path(tmp.write("scripts/a.gml", b"content"))
+        file_states = src.FileStates()
+        file_states.update(read_scripts(Path(tmp.path), {}))
+
+        assert not file_states.is_fresh(path)
+
+
+def test_file_states__touched_file_is_not_fresh():
+    with TempDirectory() as tmp:
+        path = Path(tmp.write("scripts/a.gml", b"content"))
+        file_states = src.FileStates()
+        file_states.update(read_scripts(Path(tmp.path), {}))
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert not file_states.is_fresh(path)
+
+
+def test_file_states__changed_file_is_fresh():
+    with TempDirectory() as tmp:
+        path = Path(tmp.write("scripts/a.gml", b"content"))
+        file_states = src.FileStates()
+        file_states.update(read_scripts(Path(tmp.path), {}))
+        stat = path.stat()
+        path.write_bytes(b"other")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert file_states.is_fresh(path)
+
+
+def test_file_states__save_and_read():
+    with TempDirectory() as tmp:
+        root_dir = Path(tmp.path)
+        path = Path(tmp.write("scripts/a.gml", b"content"))
+        file_states = src.FileStates()
+        file_states.update(read_scripts(root_dir, {}))
+        src.save(root_dir, file_states)
+
+        read_states = src.read(root_dir, dotfile={})
+
+        assert read_states.entries == file_states.entries
+        assert not read_states.is_fresh(path)
+
+
+def test_file_states__read_falls_back_to_dotfile():
+    with TempDirectory() as tmp:
+        root_dir = Path(tmp.path)
+        seen_path = Path(tmp.write("scripts/seen.gml", b"content"))
+        unseen_path = Path(tmp.write("scripts/unseen.gml", b"content"))
+        modified_timestamp = make_time(TEST_DATETIME_STRING).timestamp()
+        os.utime(seen_path, (modified_timestamp, modified_timestamp))
+        dotfile = {
+            PROCESSED_TIME_FIELD: make_time(TEST_LATER_DATETIME_STRING),
+            SEEN_FILES_FIELD: [seen_path.as_posix()],
+        }
+
+        file_states = src.read(root_dir, dotfile)
+
+        assert not file_states.is_fresh(seen_path)
+        assert file_states.is_fresh(unseen_path)
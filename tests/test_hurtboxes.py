@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import pytest
+from PIL import Image
+from testfixtures import TempDirectory
+
+from rivals_workshop_assistant import paths
+from rivals_workshop_assistant.aseprite_handling import read_aseprite
+from rivals_workshop_assistant.aseprite_handling._aseprite_loading import (
+    RawAsepriteFile,
+)
+from rivals_workshop_assistant.aseprite_handling.hurtboxes import (
+    get_hurtbox_frame,
+    HURTBOX_COLOR,
+)
+from rivals_workshop_assistant.aseprite_handling.rendering import get_layers_mask
+from tests.testing_helpers import assert_images_equal
+
+TEST_SPRITES_PATH = Path("tests/assets/sprites")
+TRANSPARENT = (0, 0, 0, 0)
+
+
+def test_save_hurtboxes__without_aseprite():
+    aseprite = read_aseprite(
+        path=TEST_SPRITES_PATH / "1frame_1bair.aseprite",
+        dotfile={},
+        assistant_config={},
+    )
+    with TempDirectory() as tmp:
+        root_dir = Path(tmp.path)
+        aseprite.save(root_dir=root_dir, aseprite_path=None, hurtboxes_enabled=True)
+
+        sprites_path = root_dir / paths.SPRITES_FOLDER
+        with Image.open(sprites_path / "bair_hurt_strip1.png") as actual, Image.open(
+            TEST_SPRITES_PATH / "bair_hurt.png"
+        ) as expected:
+            assert_images_equal(actual, expected)
+        assert not (sprites_path / "1frame_hurt_strip1.png").exists()
+        assert not (sprites_path / "bair_strip1.png").exists()
+
+
+@pytest.mark.parametrize(
+    "aseprite_file_name, expected_pixels",
+    [
+        pytest.param(
+            "1frame",
+            [TRANSPARENT, HURTBOX_COLOR, HURTBOX_COLOR, HURTBOX_COLOR],
+        ),
+        pytest.param(
+            "1frame_hurtmask",
+            [TRANSPARENT, TRANSPARENT, TRANSPARENT, HURTBOX_COLOR],
+        ),
+        pytest.param(
+            "1frame_hurtbox_layer",
+            [HURTBOX_COLOR, HURTBOX_COLOR, HURTBOX_COLOR, TRANSPARENT],
+        ),
+    ],
+)
+def test_get_hurtbox_frame(aseprite_file_name, expected_pixels):
+    raw = RawAsepriteFile.from_path(
+        TEST_SPRITES_PATH / f"{aseprite_file_name}.aseprite"
+    )
+
+    frame = get_hurtbox_frame(raw, frame_index=0)
+
+    assert list(frame.getdata()) == expected_pixels
+
+
+def test_get_layers_mask__layer_opacity_ignored_without_header_flag():
+    raw = RawAsepriteFile.from_path(TEST_SPRITES_PATH / "1frame.aseprite")
+    raw.header.flags = 0
+    raw.layers[0].opacity = 0
+
+    mask = get_layers_mask(raw, raw.layers, frame_index=0)
+
+    assert list(mask.getdata()) == [0, 255, 255, 255]
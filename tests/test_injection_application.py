@@ -6,6 +6,8 @@ import pytest
 import rivals_workshop_assistant.injection.application as application
 from rivals_workshop_assistant.aseprite_handling import Anim, Window
 from rivals_workshop_assistant.injection.dependency_handling import Define, Macro
+from rivals_workshop_assistant.injection.library import InjectionLibrary
+from rivals_workshop_assistant.injection.result_cache import InjectionResultCache
 from tests.testing_helpers import (
     make_script,
     make_time,
@@ -18,7 +20,9 @@ def test_apply_injection_no_injections():
     orig_scripts = [make_script(PATH_A, "content")]
     scripts = deepcopy(orig_scripts)
 
-    application.apply_injection(scripts=scripts, injection_library=[], anims=[])
+    application.apply_injection(
+        scripts=scripts, injection_library=InjectionLibrary([]), anims={}
+    )
     assert scripts == orig_scripts
 
 
@@ -27,7 +31,9 @@ def test_apply_injection_irrelevant_injection():
     scripts = deepcopy(orig_scripts)
     define = Define(name="", version=0, docs="", content="")
 
-    application.apply_injection(scripts=scripts, injection_library=[define], anims=[])
+    application.apply_injection(
+        scripts=scripts, injection_library=InjectionLibrary([define]), anims={}
+    )
     assert orig_scripts == scripts
 
 
@@ -59,7 +65,9 @@ define2()""",
 def test_apply_injection_makes_injection(script, define):
     scripts = [make_script(PATH_A, script)]
 
-    application.apply_injection(scripts=scripts, injection_library=[define], anims=[])
+    application.apply_injection(
+        scripts=scripts, injection_library=InjectionLibrary([define]), anims={}
+    )
     assert scripts == [
         make_script(
             PATH_A,
@@ -82,9 +90,9 @@ content
 define2()
 content"""
     scripts = [make_script(PATH_A, script)]
-    library = [define1, define2]
+    library = InjectionLibrary([define1, define2])
 
-    application.apply_injection(scripts=scripts, injection_library=library, anims=[])
+    application.apply_injection(scripts=scripts, injection_library=library, anims={})
     assert scripts == [
         make_script(
             PATH_A,
@@ -111,9 +119,9 @@ def test_replace_existing_library_dependencies():
 {application.INJECTION_END_HEADER}
 """
     scripts = [make_script(PATH_A, script)]
-    library = [define1]
+    library = InjectionLibrary([define1])
 
-    application.apply_injection(scripts=scripts, injection_library=library, anims=[])
+    application.apply_injection(scripts=scripts, injection_library=library, anims={})
     assert scripts == [
         make_script(
             PATH_A,
@@ -141,7 +149,9 @@ def test_removes_injection_when_not_needed():
 {application.INJECTION_END_HEADER}"""
 
     scripts = [make_script(PATH_A, script)]
-    application.apply_injection(scripts=scripts, injection_library=[define1], anims=[])
+    application.apply_injection(
+        scripts=scripts, injection_library=InjectionLibrary([define1]), anims={}
+    )
     assert scripts == [
         make_script(PATH_A, original_content=script, working_content=script_content)
     ]
@@ -162,7 +172,7 @@ define1()
     orig_scripts = [make_script(PATH_A, script)]
     scripts = deepcopy(orig_scripts)
 
-    application.apply_injection(scripts, [define1], anims=[])
+    application.apply_injection(scripts, InjectionLibrary([define1]), anims={})
     assert scripts == orig_scripts
 
 
@@ -174,9 +184,9 @@ define_recursive()"""
     recursive_define = Define(
         name="define_recursive", version=0, docs="recursive_docs", content="define1()"
     )
-    library = [recursive_define, define1]
+    library = InjectionLibrary([recursive_define, define1])
 
-    application.apply_injection(scripts, library, anims=[])
+    application.apply_injection(scripts, library, anims={})
 
     assert scripts == [
         make_script(
@@ -202,9 +212,9 @@ blah"""
 
     scripts = [make_script(PATH_A, script)]
     some_macro = Macro(name="some_macro", value="value")
-    library = [some_macro]
+    library = InjectionLibrary([some_macro])
 
-    application.apply_injection(scripts, library, anims=[])
+    application.apply_injection(scripts, library, anims={})
     assert scripts == [
         make_script(
             PATH_A,
@@ -230,9 +240,9 @@ my_define()
 
     scripts = [make_script(PATH_A, script)]
     my_define_library_version = Define(name="my_define", content="library version")
-    library = [my_define_library_version]
+    library = InjectionLibrary([my_define_library_version])
 
-    application.apply_injection(scripts, library, anims=[])
+    application.apply_injection(scripts, library, anims={})
     assert scripts == [
         make_script(PATH_A, original_content=script, working_content=script.rstrip())
     ]
@@ -248,8 +258,8 @@ define1()
     orig_scripts = [make_script(PATH_A, script)]
     scripts = deepcopy(orig_scripts)
 
-    library = [define1]
-    application.apply_injection(scripts, library, anims=[])
+    library = InjectionLibrary([define1])
+    application.apply_injection(scripts, library, anims={})
     assert scripts == orig_scripts
 
 
@@ -261,9 +271,9 @@ print(my_macro)
 
     scripts = [make_script(PATH_A, script)]
     my_macro_library_version = Macro(name="my_macro", value="3")
-    library = [my_macro_library_version]
+    library = InjectionLibrary([my_macro_library_version])
 
-    application.apply_injection(scripts, library, anims=[])
+    application.apply_injection(scripts, library, anims={})
     assert scripts == [
         make_script(PATH_A, original_content=script, working_content=script.rstrip())
     ]
@@ -282,7 +292,9 @@ define1()"""
     ]
     scripts = deepcopy(orig_scripts)
 
-    application.apply_injection(scripts=scripts, injection_library=[define], anims=[])
+    application.apply_injection(
+        scripts=scripts, injection_library=InjectionLibrary([define]), anims={}
+    )
     assert scripts == orig_scripts
 
 
@@ -294,9 +306,11 @@ def test_get_anim_data_gmls_needed_in_gml():
 
     anim = Anim(name="dattack", start=0, end=4)
     anim.windows = [Window("window", 2, 3)]
-    anims = [anim]
+    anims = {anim.name: anim}
 
-    application.apply_injection(scripts=scripts, injection_library=[], anims=anims)
+    application.apply_injection(
+        scripts=scripts, injection_library=InjectionLibrary([]), anims=anims
+    )
 
     assert scripts == [
         make_script(
@@ -310,3 +324,39 @@ def test_get_anim_data_gmls_needed_in_gml():
 {application.INJECTION_END_HEADER}""",
         )
     ]
+
+
+def test_apply_injection__cached_script_only_gets_new_anim_data(monkeypatch):
+    path = Path("scripts/attacks/dattack.gml")
+    library = InjectionLibrary([define1])
+    injection_cache = InjectionResultCache()
+    anim = Anim(name="dattack", start=0, end=4, windows=[Window("window", 1, 2)])
+
+    script = make_script(path=path, original_content="define1()")
+    application.apply_injection(
+        scripts=[script],
+        injection_library=library,
+        anims={anim.name: anim},
+        injection_cache=injection_cache,
+    )
+
+    def fail_resolving(gml):
+        assert False, "injections were resolved again"
+
+    monkeypatch.setattr(library, "get_used_indexes", fail_resolving)
+    anim.windows = [Window("window", 2, 3)]
+    application.apply_injection(
+        scripts=[script],
+        injection_library=library,
+        anims={anim.name: anim},
+        injection_cache=injection_cache,
+    )
+
+    assert script.working_content == f"""\
+define1()
+
+{application.INJECTION_START_HEADER}
+{define1.gml}
+
+{anim.windows[0].gml}
+{application.INJECTION_END_HEADER}"""
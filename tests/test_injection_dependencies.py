@@ -2,6 +2,7 @@ from copy import deepcopy
 
 import rivals_workshop_assistant.injection.application as application
 from rivals_workshop_assistant.injection.dependency_handling import Define, Macro
+from rivals_workshop_assistant.injection.library import InjectionLibrary
 
 
 def test_define_gml():
@@ -44,7 +45,9 @@ def test_define_gml_parameters():
 def test_apply_injection_nothing():
     orig_scripts = []
     scripts = deepcopy(orig_scripts)
-    application.apply_injection(scripts=scripts, injection_library=[], anims=[])
+    application.apply_injection(
+        scripts=scripts, injection_library=InjectionLibrary([]), anims={}
+    )
     assert scripts == orig_scripts
 
 
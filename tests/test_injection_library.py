@@ -1,9 +1,15 @@
+from pathlib import Path
+
 import pytest
+from testfixtures import TempDirectory
 
+import rivals_workshop_assistant.injection.library as library_module
+from rivals_workshop_assistant.paths import USER_INJECT_FOLDER
 from rivals_workshop_assistant.injection.dependency_handling import Define, \
     Macro
 from rivals_workshop_assistant.injection.library import \
-    get_injection_library_from_gml
+    get_injection_library_from_gml, InjectionLibrary, read_injection_library, \
+    CACHE_PATH
 
 
 def test_empty():
@@ -246,3 +252,78 @@ def test_loads_with_macro(content, library):
     actual_library = get_injection_library_from_gml(content)
 
     assert actual_library == library
+
+
+def test_injection_library_closures():
+    a = Define(name='a', content='b()')
+    b = Define(name='b', content='c()\nMAC')
+    c = Define(name='c', content='a()')
+    mac = Macro(name='MAC', value='1')
+    unused = Define(name='unused', content='a()')
+    library = InjectionLibrary([a, b, c, mac, unused])
+
+    assert library.get_used_injections('MAC') == [mac]
+    assert library.get_used_injections('c()') == [c, a, b, mac]
+    assert library.get_used_injections('b()\nunused()') == [b, c, a, mac, unused]
+
+
+def test_injection_library_cycles():
+    a = Define(name='a', content='b()')
+    b = Define(name='b', content='c()\nMAC')
+    c = Define(name='c', content='a()')
+    mac = Macro(name='MAC', value='1')
+    recursive = Define(name='recursive', content='recursive()\na()')
+    library = InjectionLibrary([a, b, c, mac, recursive])
+
+    assert library.get_cycle_names() == [['a', 'b', 'c']]
+
+
+def test_read_injection_library_reports_cycles(capsys):
+    with TempDirectory() as tmp:
+        root_dir = Path(tmp.path)
+        tmp.write((USER_INJECT_FOLDER / 'lib.gml').as_posix(),
+                  b'#define a\n    b()\n\n#define b\n    a()\n')
+        read_injection_library(root_dir)
+
+    assert ('WARN: The injections a, b use each other in a cycle.'
+            in capsys.readouterr().out)
+
+
+def test_injection_library_duplicate_injections():
+    a = Define(name='a', content='content')
+    library = InjectionLibrary([a, Define(name='a', content='content')])
+
+    assert library.get_used_injections('a()') == [a]
+
+
+def test_read_injection_library_is_cached(monkeypatch):
+    with TempDirectory() as tmp:
+        root_dir = Path(tmp.path)
+        tmp.write((USER_INJECT_FOLDER / 'lib.gml').as_posix(),
+                  b'#define a\n    b()\n\n#define b\n    content\n')
+        library = read_injection_library(root_dir)
+        assert (root_dir / CACHE_PATH).exists()
+
+        def fail_parsing(gml):
+            assert False, 'the library was parsed again'
+
+        with monkeypatch.context() as patch:
+            patch.setattr(library_module, 'get_injection_library_from_gml',
+                          fail_parsing)
+            cached_library = read_injection_library(root_dir)
+            patch.setattr(library_module, '_loaded_libraries', {})
+            saved_library = read_injection_library(root_dir)
+
+        tmp.write((USER_INJECT_FOLDER / 'lib.gml').as_posix(),
+                  b'#define a\n    content\n\n')
+        changed_library = read_injection_library(root_dir)
+
+    assert cached_library.injections == library.injections
+    assert cached_library.get_used_injections('a()') == library.injections
+    assert saved_library is not library
+    assert saved_library.injections == library.injections
+    assert all(type(injection) is Define
+               for injection in saved_library.injections)
+    assert saved_library.get_used_injections('a()') == library.injections
+    assert saved_library.fingerprint == library.fingerprint
+    assert changed_library.injections == [Define(name='a', content='content')]
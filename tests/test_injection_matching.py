@@ -0,0 +1,60 @@
+import re
+
+import pytest
+
+from rivals_workshop_assistant.injection.dependency_handling import Define, Macro
+from rivals_workshop_assistant.injection.matching import (
+    InjectionMatcher,
+    get_gml_identifiers,
+)
+
+library = [
+    Define(name="func", content="content"),
+    Define(name="other_func", params=["a"], content="func(a)"),
+    Macro(name="MACRO", value="1"),
+    Macro(name="func", value="2"),
+    Define(name="", content="empty name"),
+]
+
+
+@pytest.mark.parametrize(
+    "gml",
+    [
+        pytest.param(""),
+        pytest.param("func()"),
+        pytest.param("a = func(1)"),
+        pytest.param("a = func (1)"),
+        pytest.param("a = myfunc(1)"),
+        pytest.param("a = func_b(1)"),
+        pytest.param("a = obj.func(1)"),
+        pytest.param("#define func(a)"),
+        pytest.param("#define  func(a)"),
+        pytest.param("x#define func(a)"),
+        pytest.param("#define\tfunc(a)"),
+        pytest.param("a = 1\n#define func(a)"),
+        pytest.param("#define func(a)\nfunc(2)"),
+        pytest.param("MACRO"),
+        pytest.param("a = MACRO+1\n"),
+        pytest.param("a = MACROS"),
+        pytest.param("a = _MACRO"),
+        pytest.param("other_func(func)"),
+        pytest.param("no calls here"),
+    ],
+)
+def test_injection_matcher__matches_use_patterns(gml):
+    expected = [
+        injection
+        for injection in library
+        if re.search(pattern=injection.use_pattern, string=gml)
+    ]
+
+    assert InjectionMatcher(library).get_used_injections(gml) == expected
+
+
+def test_get_gml_identifiers():
+    identifiers, called_identifiers = get_gml_identifiers(
+        "#define func(a)\nvar b = other_func(a.c) + 2;"
+    )
+
+    assert identifiers == {"define", "func", "a", "var", "b", "other_func", "c", "2"}
+    assert called_identifiers == {"other_func"}
@@ -76,7 +76,7 @@ def test__install_release():
             tmp,
             ScriptWithPath(
                 path=rivals_workshop_assistant.dotfile_mod.PATH,
-                content=f"{LIBRARY_VERSION_FIELD}: 0.0.0",
+                content=f'{{"{LIBRARY_VERSION_FIELD}": "0.0.0"}}',
             ),
         )
         create_script(
@@ -108,7 +108,7 @@ def test_read_injection_library():
         create_script(tmp, injection_in_subfolder)
 
         result_library = injection.read_injection_library(Path(tmp.path))
-        assert result_library == [func, another_func, needs_other, other]
+        assert result_library.injections == [func, another_func, needs_other, other]
 
 
 def test_full_injection():
@@ -121,7 +121,7 @@ def test_full_injection():
         scripts = rivals_workshop_assistant.script_mod.read_scripts(Path(tmp.path), {})
         library = injection.read_injection_library(Path(tmp.path))
 
-        apply_injection(scripts=scripts, injection_library=library, anims=[])
+        apply_injection(scripts=scripts, injection_library=library, anims={})
 
         expected_script_1 = f"""\
 {script_1.content}
@@ -171,13 +171,13 @@ def test__make_basic_folder_structure__make_missing_config():
     with TempDirectory() as tmp:
         make_basic_folder_structure(Path(tmp.path), Path(tmp.path))
 
-        actual = info_files.YAML_HANDLER.load(
+        actual = info_files.get_yaml_handler().load(
             (
                 Path(tmp.path) / rivals_workshop_assistant.assistant_config_mod.PATH
             ).read_text()
         )
 
-        expected = info_files.YAML_HANDLER.load(
+        expected = info_files.get_yaml_handler().load(
             rivals_workshop_assistant.assistant_config_mod.DEFAULT_CONFIG
         )
         assert actual == expected
@@ -221,12 +221,12 @@ def test__make_basic_folder_structure__overwrites_config():
                 / rivals_workshop_assistant.assistant_config_mod.PATH
             )
 
-            actual = info_files.YAML_HANDLER.load(project_config_path.read_text())
+            actual = info_files.get_yaml_handler().load(project_config_path.read_text())
 
-            expected = info_files.YAML_HANDLER.load(
+            expected = info_files.get_yaml_handler().load(
                 rivals_workshop_assistant.assistant_config_mod.DEFAULT_CONFIG
             )
-            expected.update(info_files.YAML_HANDLER.load(default_override))
+            expected.update(info_files.get_yaml_handler().load(default_override))
 
             assert actual == expected
 
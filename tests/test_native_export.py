@@ -0,0 +1,162 @@
+from pathlib import Path
+
+import pytest
+from PIL import Image
+from testfixtures import TempDirectory
+
+from rivals_workshop_assistant import paths
+from rivals_workshop_assistant.aseprite_handling import (
+    read_aseprite,
+    export_cache,
+    native_export,
+)
+from rivals_workshop_assistant.assistant_config_mod import (
+    ANIM_TAG_COLOR_FIELD,
+    ExportBackend,
+)
+from rivals_workshop_assistant.aseprite_handling._aseprite_loading import (
+    RawAsepriteFile,
+)
+from rivals_workshop_assistant.aseprite_handling.exporting import (
+    ExportJob,
+    ANIM_EXPORT,
+)
+from tests.testing_helpers import assert_images_equal
+
+TEST_SPRITES_PATH = Path("tests/assets/sprites")
+
+
+def assert_native_export_saves_right_anims(
+    aseprite_file_name: str,
+    save_file_names: list,
+    expected_file_names: list,
+    assistant_config: dict = None,
+    has_small_sprites: bool = False,
+):
+    if assistant_config is None:
+        assistant_config = {}
+
+    aseprite = read_aseprite(
+        path=TEST_SPRITES_PATH / f"{aseprite_file_name}.aseprite",
+        dotfile={},
+        assistant_config=assistant_config,
+    )
+    with TempDirectory() as tmp:
+        root_dir = Path(tmp.path)
+        aseprite.save(
+            root_dir=root_dir,
+            aseprite_path=None,
+            has_small_sprites=has_small_sprites,
+            export_backend=ExportBackend.NATIVE,
+        )
+
+        for save_file_name, expected_file_name in zip(
+            save_file_names, expected_file_names
+        ):
+            actual_path = root_dir / paths.SPRITES_FOLDER / f"{save_file_name}.png"
+            expected_path = TEST_SPRITES_PATH / f"{expected_file_name}.png"
+            with Image.open(actual_path) as actual, Image.open(
+                expected_path
+            ) as expected:
+                assert_images_equal(actual, expected)
+
+
+@pytest.mark.parametrize(
+    "aseprite_file_name, save_file_names, expected_file_names",
+    [
+        pytest.param("1frame", ["1frame_strip1"], ["1frame"]),
+        pytest.param("2frame", ["2frame_strip2"], ["2frame"]),
+        pytest.param(
+            "1frame_2frame", ["1frame_strip1", "2frame_strip2"], ["1frame", "2frame"]
+        ),
+        pytest.param(
+            "1frame_2frame_red_tag",
+            ["1frame_2frame_red_tag_strip3"],
+            ["1frame_2frame"],
+        ),
+        pytest.param(
+            "1frame_1bair",
+            ["1frame_strip1", "bair_strip1"],
+            ["1frame", "bair_big"],
+        ),
+        pytest.param("1frame_hurtmask", ["1frame_hurtmask_strip1"], ["1frame"]),
+        pytest.param(
+            "1frame_hurtbox_layer", ["1frame_hurtbox_layer_strip1"], ["1frame"]
+        ),
+    ],
+)
+def test_native_export(aseprite_file_name, save_file_names, expected_file_names):
+    assert_native_export_saves_right_anims(
+        aseprite_file_name=aseprite_file_name,
+        save_file_names=save_file_names,
+        expected_file_names=expected_file_names,
+    )
+
+
+def test_native_export__red_anim_tags():
+    assert_native_export_saves_right_anims(
+        aseprite_file_name="1frame_2frame_red_tag",
+        save_file_names=["1frame_strip1", "2frame_strip2"],
+        expected_file_names=["1frame", "2frame"],
+        assistant_config={ANIM_TAG_COLOR_FIELD: "red"},
+    )
+
+
+def test_native_export__small_sprites():
+    assert_native_export_saves_right_anims(
+        aseprite_file_name="1frame_1bair",
+        save_file_names=["1frame_strip1", "bair_strip1"],
+        expected_file_names=["1frame", "bair"],
+        has_small_sprites=True,
+    )
+
+
+def test_export_cache__unchanged_anims_are_skipped(monkeypatch):
+    aseprite = read_aseprite(
+        path=TEST_SPRITES_PATH / "1frame_2frame.aseprite",
+        dotfile={},
+        assistant_config={},
+    )
+    with TempDirectory() as tmp:
+        root_dir = Path(tmp.path)
+        cache = export_cache.read(root_dir)
+        aseprite.save(
+            root_dir=root_dir,
+            aseprite_path=None,
+            export_backend=ExportBackend.NATIVE,
+            export_cache=cache,
+        )
+        export_cache.save(root_dir, cache)
+
+        sprites_path = root_dir / paths.SPRITES_FOLDER
+        (sprites_path / "2frame_strip2.png").unlink()
+
+        exported_dests = []
+        monkeypatch.setattr(
+            native_export,
+            "save_anim_strip",
+            lambda raw, job: exported_dests.append(job.dest.name),
+        )
+        aseprite.save(
+            root_dir=root_dir,
+            aseprite_path=None,
+            export_backend=ExportBackend.NATIVE,
+            export_cache=export_cache.read(root_dir),
+        )
+
+        assert exported_dests == ["2frame_strip2.png"]
+
+
+def test_export_cache__fingerprint_depends_on_frames_and_params():
+    raw = RawAsepriteFile.from_path(TEST_SPRITES_PATH / "1frame_2frame.aseprite")
+
+    def fingerprint(start, end, scale=2, export_backend=ExportBackend.NATIVE):
+        job = ExportJob(
+            kind=ANIM_EXPORT, start=start, end=end, scale=scale, dest=Path("a.png")
+        )
+        return export_cache.get_job_fingerprint(raw, job, export_backend)
+
+    assert fingerprint(0, 0) == fingerprint(0, 0)
+    assert fingerprint(0, 0) != fingerprint(1, 2)
+    assert fingerprint(0, 0) != fingerprint(0, 0, scale=1)
+    assert fingerprint(0, 0) != fingerprint(0, 0, export_backend=ExportBackend.ASEPRITE)
@@ -0,0 +1,95 @@
+import os
+from pathlib import Path
+
+from testfixtures import TempDirectory
+
+from rivals_workshop_assistant.run_context import RunContext
+
+
+def make_reader(path: Path, reads: list):
+    def read():
+        reads.append(path)
+        return path.read_text() if path.exists() else None
+
+    return read
+
+
+def test_read__unchanged_file_isnt_read_again():
+    with TempDirectory() as tmp:
+        path = Path(tmp.write("a.json", b"1"))
+        context = RunContext()
+        reads = []
+
+        first = context.read(path, make_reader(path, reads))
+        second = context.read(path, make_reader(path, reads))
+
+    assert first == second == "1"
+    assert len(reads) == 1
+
+
+def test_read__changed_file_is_read_again():
+    with TempDirectory() as tmp:
+        path = Path(tmp.write("a.json", b"1"))
+        context = RunContext()
+        reads = []
+        context.read(path, make_reader(path, reads))
+
+        path.write_text("22")
+        value = context.read(path, make_reader(path, reads))
+
+    assert value == "22"
+    assert len(reads) == 2
+
+
+def test_read__touched_file_is_read_again():
+    with TempDirectory() as tmp:
+        path = Path(tmp.write("a.json", b"1"))
+        context = RunContext()
+        reads = []
+        context.read(path, make_reader(path, reads))
+
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        context.read(path, make_reader(path, reads))
+
+    assert len(reads) == 2
+
+
+def test_read__missing_file_is_always_read():
+    with TempDirectory() as tmp:
+        path = Path(tmp.path) / "a.json"
+        context = RunContext()
+        reads = []
+
+        context.read(path, make_reader(path, reads))
+        context.read(path, make_reader(path, reads))
+
+    assert len(reads) == 2
+
+
+def test_saved__saved_value_is_used_next_run():
+    with TempDirectory() as tmp:
+        path = Path(tmp.write("a.json", b"1"))
+        context = RunContext()
+        reads = []
+        context.read(path, make_reader(path, reads))
+
+        path.write_text("2")
+        context.saved(path, "saved")
+        value = context.read(path, make_reader(path, reads))
+
+    assert value == "saved"
+    assert len(reads) == 1
+
+
+def test_clear__values_are_read_again():
+    with TempDirectory() as tmp:
+        path = Path(tmp.write("a.json", b"1"))
+        context = RunContext()
+        reads = []
+        context.read(path, make_reader(path, reads))
+
+        context.clear()
+        context.read(path, make_reader(path, reads))
+
+    assert len(reads) == 2
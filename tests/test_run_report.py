@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from rivals_workshop_assistant.run_report import RunReport
+from tests.testing_helpers import make_script
+
+
+def test_run_report_to_json():
+    root_dir = Path("C:/char")
+    changed_script = make_script(
+        root_dir / "scripts/attacks/nair.gml",
+        original_content="a = 1 // WARN: old\nb = 2\nc = 3",
+        working_content="a = 1 // WARN: old\nb = 2 // WARN: first // WARN: second\nc = 3",
+    )
+    unchanged_script = make_script(
+        root_dir / "scripts/init.gml", original_content="d = 4 // WARN: old"
+    )
+    report = RunReport(
+        scripts=[changed_script, unchanged_script],
+        exported_paths=[root_dir / "sprites/nair_strip4.png"],
+        timings={"total": 0.5},
+    )
+
+    assert report.to_json(root_dir) == {
+        "changed_files": ["scripts/attacks/nair.gml"],
+        "warnings_added": [
+            {"file": "scripts/attacks/nair.gml", "line": 2, "warning": "first"},
+            {"file": "scripts/attacks/nair.gml", "line": 2, "warning": "second"},
+        ],
+        "exported_sprites": ["sprites/nair_strip4.png"],
+        "timings": {"total": 0.5},
+    }
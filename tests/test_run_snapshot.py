@@ -0,0 +1,190 @@
+import os
+from pathlib import Path
+
+from testfixtures import TempDirectory
+
+from rivals_workshop_assistant import main, run_snapshot as src
+
+VERSION = "1.0.0"
+
+
+def make_project(tmp: TempDirectory) -> Path:
+    tmp.write("config.ini", b"[general]")
+    tmp.write("scripts/a.gml", b"content")
+    tmp.write("assistant/user_inject/lib.gml", b"#define a {}")
+    return Path(tmp.path)
+
+
+def test_is_unchanged__no_snapshot():
+    with TempDirectory() as tmp:
+        root_dir = make_project(tmp)
+
+        assert not src.is_unchanged(root_dir, VERSION)
+
+
+def test_is_unchanged__after_save():
+    with TempDirectory() as tmp:
+        root_dir = make_project(tmp)
+        src.save(root_dir, VERSION)
+
+        assert src.is_unchanged(root_dir, VERSION)
+
+
+def test_is_unchanged__new_assistant_version():
+    with TempDirectory() as tmp:
+        root_dir = make_project(tmp)
+        src.save(root_dir, VERSION)
+
+        assert not src.is_unchanged(root_dir, "1.0.1")
+
+
+def test_is_unchanged__file_modified():
+    with TempDirectory() as tmp:
+        root_dir = make_project(tmp)
+        src.save(root_dir, VERSION)
+        path = root_dir / "scripts/a.gml"
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert not src.is_unchanged(root_dir, VERSION)
+
+
+def test_is_unchanged__file_added():
+    with TempDirectory() as tmp:
+        root_dir = make_project(tmp)
+        src.save(root_dir, VERSION)
+        tmp.write("anims/nair.aseprite", b"")
+
+        assert not src.is_unchanged(root_dir, VERSION)
+
+
+def test_is_unchanged__file_removed():
+    with TempDirectory() as tmp:
+        root_dir = make_project(tmp)
+        src.save(root_dir, VERSION)
+        (root_dir / "assistant/user_inject/lib.gml").unlink()
+
+        assert not src.is_unchanged(root_dir, VERSION)
+
+
+def test_is_unchanged__unwatched_file_added():
+    with TempDirectory() as tmp:
+        root_dir = make_project(tmp)
+        src.save(root_dir, VERSION)
+        tmp.write("assistant/.export_cache", b"{}")
+
+        assert src.is_unchanged(root_dir, VERSION)
+
+
+def test_save__file_changed_during_run():
+    with TempDirectory() as tmp:
+        root_dir = make_project(tmp)
+        states_before = src.get_states(root_dir)
+        tmp.write("scripts/a.gml", b"edited during the run")
+        tmp.write("scripts/b.gml", b"added during the run")
+        src.save(root_dir, VERSION, states_before=states_before)
+
+        assert not src.is_unchanged(root_dir, VERSION)
+
+
+def test_save__file_written_by_run():
+    with TempDirectory() as tmp:
+        root_dir = make_project(tmp)
+        states_before = src.get_states(root_dir)
+        tmp.write("scripts/a.gml", b"written by the run")
+        tmp.write("assistant/inject/lib.gml", b"#define b {}")
+        src.save(
+            root_dir,
+            VERSION,
+            states_before=states_before,
+            written_paths=[root_dir / "scripts/a.gml", root_dir / "assistant/inject"],
+        )
+
+        assert src.is_unchanged(root_dir, VERSION)
+
+
+def test_run__file_changed_during_run_is_processed_next_run(monkeypatch, capsys):
+    with TempDirectory() as tmp:
+        root_dir = make_project(tmp)
+        monkeypatch.setattr(main.updating, "update", lambda **kwargs: None)
+        process_scripts = main.process_scripts
+
+        def process_scripts_and_edit(**kwargs):
+            tmp.write("scripts/a.gml", b"edited during the run")
+            return process_scripts(**kwargs)
+
+        monkeypatch.setattr(main, "process_scripts", process_scripts_and_edit)
+        main.run(exe_dir=root_dir, root_dir=root_dir)
+        monkeypatch.setattr(main, "process_scripts", process_scripts)
+        capsys.readouterr()
+
+        report = main.run(exe_dir=root_dir, root_dir=root_dir)
+        output = capsys.readouterr().out
+        main.run(exe_dir=root_dir, root_dir=root_dir)
+        next_output = capsys.readouterr().out
+
+    assert "Nothing changed since the last run." not in output
+    assert [
+        script.original_content for script in report.scripts if script.is_fresh
+    ] == ["edited during the run"]
+    assert "Nothing changed since the last run." in next_output
+
+
+def test_watch__file_changed_during_run_starts_another_run(monkeypatch):
+    with TempDirectory() as tmp:
+        root_dir = make_project(tmp)
+        monkeypatch.setattr(main.updating, "update", lambda **kwargs: None)
+        process_scripts = main.process_scripts
+
+        def process_scripts_and_edit(**kwargs):
+            tmp.write("scripts/a.gml", b"edited during the run")
+            return process_scripts(**kwargs)
+
+        waited_snapshots = []
+
+        def wait_for_change(root_dir, assistant_version, snapshot, **kwargs):
+            waited_snapshots.append(snapshot)
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(main, "process_scripts", process_scripts_and_edit)
+        monkeypatch.setattr(main.run_snapshot, "wait_for_change", wait_for_change)
+        main.watch(exe_dir=root_dir, given_dir=root_dir)
+        edited_snapshot = src.get_snapshot(root_dir, main.__version__)
+        monkeypatch.setattr(main, "process_scripts", process_scripts)
+        main.watch(exe_dir=root_dir, given_dir=root_dir)
+        unedited_snapshot = src.get_snapshot(root_dir, main.__version__)
+
+    assert waited_snapshots[0] != edited_snapshot
+    assert waited_snapshots[1] == unedited_snapshot
+
+
+def test_wait_for_change__waits_until_changes_settle():
+    with TempDirectory() as tmp:
+        root_dir = make_project(tmp)
+        snapshot = src.get_snapshot(root_dir, VERSION)
+        changes = [
+            None,
+            lambda: tmp.write("scripts/b.gml", b"b"),
+            lambda: tmp.write("scripts/c.gml", b"c"),
+            None,
+        ]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            change = changes.pop(0)
+            if change is not None:
+                change()
+
+        new_snapshot = src.wait_for_change(
+            root_dir,
+            VERSION,
+            snapshot,
+            poll_interval=1,
+            debounce_time=0.1,
+            sleep=sleep,
+        )
+
+        assert sleeps == [1, 1, 0.1, 0.1]
+        assert new_snapshot == src.get_snapshot(root_dir, VERSION)
+        assert new_snapshot != snapshot
@@ -0,0 +1,112 @@
+from copy import deepcopy
+from pathlib import Path
+
+import pytest
+from testfixtures import TempDirectory
+
+from rivals_workshop_assistant.assistant_config_mod import (
+    WARNINGS_FIELD,
+    WARNING_RECURSIVE_SET_ATTACK,
+)
+from rivals_workshop_assistant.asset_handling.asset_types import Sprite
+from rivals_workshop_assistant.injection.result_cache import InjectionResultCache
+from rivals_workshop_assistant.paths import USER_INJECT_FOLDER
+from rivals_workshop_assistant.script_processing import process_scripts
+from rivals_workshop_assistant.warning_handling.result_cache import WarningResultCache
+from tests.testing_helpers import (
+    make_script,
+    make_time,
+    ScriptWithPath,
+    create_script,
+    TEST_LATER_DATETIME_STRING,
+)
+
+injection_library = ScriptWithPath(
+    path=USER_INJECT_FOLDER / Path("library.gml"),
+    content="""\
+#define needs_other {
+    other()
+}
+
+#define other
+    other content
+
+""",
+)
+
+
+def make_scripts():
+    return [
+        make_script(
+            Path(f"scripts/script_{i}.gml"),
+            f"needs_other()\nsprite_get('sprite_{i}')\n$foreach things$\n"
+            f"set_attack(AT_JAB)",
+        )
+        for i in range(4)
+    ] + [
+        make_script(
+            Path("scripts/processed.gml"),
+            "needs_other()",
+            processed_time=make_time(TEST_LATER_DATETIME_STRING),
+        )
+    ]
+
+
+@pytest.mark.parametrize("max_script_workers", [1, 3])
+def test_process_scripts(max_script_workers):
+    scripts = make_scripts()
+    with TempDirectory() as tmp:
+        create_script(tmp, injection_library)
+        assets = process_scripts(
+            root_dir=Path(tmp.path),
+            dotfile={},
+            assistant_config={WARNINGS_FIELD: [WARNING_RECURSIVE_SET_ATTACK]},
+            scripts=scripts,
+            anims={},
+            max_script_workers=max_script_workers,
+        )
+
+    assert assets == {Sprite(f"sprite_{i}") for i in range(4)}
+    for script in scripts[:4]:
+        assert "#define needs_other" in script.working_content
+        assert "#define other" in script.working_content
+        assert "for (var thing_i" in script.working_content
+    assert scripts[4].working_content == "needs_other()"
+
+
+def test_process_scripts__parallel_matches_serial():
+    serial_scripts = make_scripts()
+    parallel_scripts = deepcopy(serial_scripts)
+    caches = {}
+    for scripts, max_script_workers in (
+        (serial_scripts, 1),
+        (parallel_scripts, 2),
+    ):
+        # A root of its own for each run, so the parallel run can't reuse
+        # results the serial run cached.
+        with TempDirectory() as tmp:
+            create_script(tmp, injection_library)
+            injection_cache = InjectionResultCache()
+            warning_cache = WarningResultCache()
+            process_scripts(
+                root_dir=Path(tmp.path),
+                dotfile={},
+                assistant_config={WARNINGS_FIELD: [WARNING_RECURSIVE_SET_ATTACK]},
+                scripts=scripts,
+                anims={},
+                max_script_workers=max_script_workers,
+                injection_cache=injection_cache,
+                warning_cache=warning_cache,
+            )
+        caches[max_script_workers] = (injection_cache, warning_cache)
+
+    assert [script.working_content for script in parallel_scripts] == [
+        script.working_content for script in serial_scripts
+    ]
+    fresh_paths = {script.path.as_posix() for script in parallel_scripts[:4]}
+    for injection_cache, warning_cache in caches.values():
+        assert set(injection_cache.entries) == fresh_paths
+        assert set(warning_cache.entries) == fresh_paths
+    for script in parallel_scripts[:4]:
+        assert "#define needs_other" in script.working_content
+        assert "for (var thing_i" in script.working_content
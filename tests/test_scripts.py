@@ -1,9 +1,13 @@
+import datetime
+from pathlib import Path
+
+from testfixtures import TempDirectory
+
 import rivals_workshop_assistant.dotfile_mod
 import rivals_workshop_assistant.file_handling
 from tests.testing_helpers import (
     PATH_ABSOLUTE,
     make_time,
-    make_script,
     TEST_LATER_DATETIME_STRING,
 )
 
@@ -39,16 +43,69 @@ def test_dotfile_after_saving():
         ),
     }
 
-    script = make_script(PATH_ABSOLUTE, "content")
     time = make_time()
 
     rivals_workshop_assistant.dotfile_mod.update_dotfile_after_saving(
-        dotfile=dotfile, now=time, files=[script]
+        dotfile=dotfile, now=time
     )
 
     assert dotfile == {
-        rivals_workshop_assistant.dotfile_mod.SEEN_FILES_FIELD: [
-            script.path.as_posix()
-        ],
         rivals_workshop_assistant.dotfile_mod.PROCESSED_TIME_FIELD: time,
     }
+
+
+def test_dotfile_save_and_read():
+    dotfile = {
+        rivals_workshop_assistant.dotfile_mod.ASSISTANT_VERSION_FIELD: "1.1.2",
+        rivals_workshop_assistant.dotfile_mod.LAST_UPDATED_FIELD: datetime.date(
+            2021, 3, 4
+        ),
+        rivals_workshop_assistant.dotfile_mod.PROCESSED_TIME_FIELD: make_time(),
+    }
+    with TempDirectory() as tmp:
+        rivals_workshop_assistant.dotfile_mod.save_dotfile(Path(tmp.path), dotfile)
+
+        result = rivals_workshop_assistant.dotfile_mod.read(Path(tmp.path))
+
+    assert result == dotfile
+
+
+def test_dotfile_read__migrates_legacy_yaml():
+    with TempDirectory() as tmp:
+        tmp.write(
+            rivals_workshop_assistant.dotfile_mod.LEGACY_PATH.as_posix(),
+            b"assistant_version: 1.1.2\n"
+            b"last_updated: 2021-03-04\n"
+            b"processed_time: 2019-12-04 09:34:22\n"
+            b"seen_files:\n- scripts/init.gml\n",
+        )
+        root_dir = Path(tmp.path)
+
+        result = rivals_workshop_assistant.dotfile_mod.read(root_dir)
+
+        assert not (
+            root_dir / rivals_workshop_assistant.dotfile_mod.LEGACY_PATH
+        ).exists()
+        assert rivals_workshop_assistant.dotfile_mod.read(root_dir) == result
+    assert result == {
+        rivals_workshop_assistant.dotfile_mod.ASSISTANT_VERSION_FIELD: "1.1.2",
+        rivals_workshop_assistant.dotfile_mod.LAST_UPDATED_FIELD: datetime.date(
+            2021, 3, 4
+        ),
+        rivals_workshop_assistant.dotfile_mod.PROCESSED_TIME_FIELD: make_time(),
+        rivals_workshop_assistant.dotfile_mod.SEEN_FILES_FIELD: ["scripts/init.gml"],
+    }
+
+
+def test_dotfile_read__unreadable_date_is_left_out():
+    with TempDirectory() as tmp:
+        tmp.write(
+            rivals_workshop_assistant.dotfile_mod.PATH.as_posix(),
+            b'{"last_updated": "yesterday", "library_version": "1.0.0"}',
+        )
+
+        result = rivals_workshop_assistant.dotfile_mod.read(Path(tmp.path))
+
+    assert result == {
+        rivals_workshop_assistant.dotfile_mod.LIBRARY_VERSION_FIELD: "1.0.0"
+    }
@@ -0,0 +1,144 @@
+import json
+from pathlib import Path
+
+import pytest
+from testfixtures import TempDirectory
+
+from rivals_workshop_assistant import server as src
+
+
+def make_process_root(reports, processed_roots):
+    def process_root(root_dir: Path):
+        processed_roots.append(root_dir)
+        return reports.pop(0)
+
+    return process_root
+
+
+ALLOWED_ROOT_DIRS = src.get_allowed_root_dirs([Path("char")])
+
+
+def test_handle_request__process_root():
+    processed_roots = []
+    process_root = make_process_root([{"changed_files": ["a.gml"]}], processed_roots)
+    request = json.dumps({"command": "process_root", "root": "char"}).encode()
+
+    response = src.handle_request(request, process_root, ALLOWED_ROOT_DIRS)
+
+    assert processed_roots == [Path("char")]
+    assert response[src.OK_FIELD] is True
+    assert response["changed_files"] == ["a.gml"]
+    assert response[src.SECONDS_FIELD] >= 0
+
+
+def test_handle_request__process_file():
+    with TempDirectory() as tmp:
+        tmp.write("char/config.ini", b"")
+        script_path = Path(tmp.write("char/scripts/attacks/nair.gml", b""))
+        processed_roots = []
+        process_root = make_process_root([{}], processed_roots)
+        request = json.dumps(
+            {"command": "process_file", "path": script_path.as_posix()}
+        ).encode()
+
+        response = src.handle_request(
+            request, process_root, src.get_allowed_root_dirs([Path(tmp.path) / "char"])
+        )
+
+        assert processed_roots == [Path(tmp.path).resolve() / "char"]
+        assert response[src.OK_FIELD] is True
+
+
+def test_handle_request__process_file_outside_character():
+    with TempDirectory() as tmp:
+        tmp_dir = Path(tmp.path)
+        script_path = Path(tmp.write("scripts/nair.gml", b""))
+        request = json.dumps(
+            {"command": "process_file", "path": script_path.as_posix()}
+        ).encode()
+
+        response = src.handle_request(
+            request, make_process_root([], []), src.get_allowed_root_dirs([tmp_dir])
+        )
+
+        assert response[src.OK_FIELD] is False
+
+
+def test_handle_request__bad_requests():
+    process_root = make_process_root([], [])
+    for request in (
+        b"not json",
+        b"[]",
+        b'{"command": "other"}',
+        b'{"command": "process_root"}',
+    ):
+        response = src.handle_request(request, process_root, ALLOWED_ROOT_DIRS)
+
+        assert response[src.OK_FIELD] is False
+        assert response[src.ERROR_FIELD]
+
+
+def test_handle_request__already_running():
+    request = json.dumps({"command": "process_root", "root": "char"}).encode()
+
+    response = src.handle_request(
+        request, make_process_root([None], []), ALLOWED_ROOT_DIRS
+    )
+
+    assert response[src.OK_FIELD] is False
+
+
+def test_handle_request__error_while_processing():
+    def process_root(root_dir: Path):
+        raise FileNotFoundError("no config.ini")
+
+    request = json.dumps({"command": "process_root", "root": "char"}).encode()
+
+    response = src.handle_request(request, process_root, ALLOWED_ROOT_DIRS)
+
+    assert response == {
+        src.OK_FIELD: False,
+        src.ERROR_FIELD: "FileNotFoundError: no config.ini",
+    }
+
+
+def test_handle_request__process_root_not_allowed():
+    processed_roots = []
+    request = json.dumps({"command": "process_root", "root": "other_char"}).encode()
+
+    response = src.handle_request(
+        request, make_process_root([{}], processed_roots), ALLOWED_ROOT_DIRS
+    )
+
+    assert processed_roots == []
+    assert response[src.OK_FIELD] is False
+
+
+def test_handle_request__process_file_not_allowed():
+    with TempDirectory() as tmp:
+        tmp.write("char/config.ini", b"")
+        tmp.write("other_char/config.ini", b"")
+        script_path = Path(tmp.write("other_char/scripts/nair.gml", b""))
+        processed_roots = []
+        request = json.dumps(
+            {"command": "process_file", "path": script_path.as_posix()}
+        ).encode()
+
+        response = src.handle_request(
+            request,
+            make_process_root([{}], processed_roots),
+            src.get_allowed_root_dirs([Path(tmp.path) / "char"]),
+        )
+
+    assert processed_roots == []
+    assert response[src.OK_FIELD] is False
+
+
+def test_parse_port():
+    assert src.parse_port("8000") == 8000
+
+
+@pytest.mark.parametrize("port_string", ["", "port", "0", "65536", "-1", "80.5"])
+def test_parse_port__invalid(port_string):
+    with pytest.raises(ValueError):
+        src.parse_port(port_string)
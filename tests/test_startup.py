@@ -0,0 +1,74 @@
+"""Guards the assistant's cold start time, by checking that slow imports are only
+made by the steps that need them."""
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from testfixtures import TempDirectory
+
+REPO_ROOT = Path(__file__).parent.parent
+ENTRY_POINT = "rivals_workshop_assistant.main"
+SLOW_IMPORTS = ["requests", "PIL", "inflector", "parse", "ruamel"]
+
+
+def get_entry_point_import_times() -> dict:
+    """The cumulative import time of each module imported by the entry point,
+    in microseconds, from python -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {ENTRY_POINT}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|")
+        if cumulative.strip().isdigit():
+            import_times[module.strip()] = int(cumulative)
+    # Modules imported before the package, like by site, aren't the assistant's.
+    module_names = list(import_times)
+    first_index = module_names.index(ENTRY_POINT.split(".")[0])
+    return {name: import_times[name] for name in module_names[first_index:]}
+
+
+def get_slow_imports(module_names) -> list:
+    return [name for name in module_names if name.split(".")[0] in SLOW_IMPORTS]
+
+
+def test_entry_point_doesnt_import_slow_dependencies():
+    import_times = get_entry_point_import_times()
+
+    assert (
+        get_slow_imports(import_times) == []
+    ), f"{ENTRY_POINT} took {import_times[ENTRY_POINT] / 1000:.0f}ms to import"
+
+
+def test_run_with_nothing_changed_doesnt_import_slow_dependencies():
+    with TempDirectory() as tmp:
+        tmp.write("config.ini", b"")
+        tmp.write("scripts/init.gml", b"")
+        script = textwrap.dedent(f"""\
+            import sys
+            from pathlib import Path
+            from rivals_workshop_assistant import main, run_snapshot
+
+            root_dir = Path({tmp.path!r})
+            run_snapshot.save(root_dir, main.__version__)
+            main.main(exe_dir=root_dir, given_dir=root_dir)
+            print("\\n".join(sys.modules))
+            """)
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+    assert "Nothing changed since the last run." in result.stdout
+    assert get_slow_imports(result.stdout.splitlines()) == []
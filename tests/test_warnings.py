@@ -1,3 +1,4 @@
+import re
 from pathlib import Path
 
 import pytest
@@ -9,7 +10,12 @@ from rivals_workshop_assistant.assistant_config_mod import (
     WARNINGS_FIELD,
     WARNING_DESYNC_OBJECT_VAR_SET_IN_DRAW_SCRIPT_VALUE,
 )
-from rivals_workshop_assistant.warning_handling import _remove_warnings
+from rivals_workshop_assistant.warning_handling import (
+    _remove_warnings,
+    _apply_warnings_to_script,
+)
+from rivals_workshop_assistant.warning_handling.base import WarningType
+from rivals_workshop_assistant.warning_handling.result_cache import WarningResultCache
 from tests.testing_helpers import make_script
 
 
@@ -193,8 +199,127 @@ def test_handle_warn_check_window_timer_mod_without_check_hitpause(
             f"twice! {rivals_workshop_assistant.warning_handling.desync.ObjectVarSetInDrawScript.get_warning_text()}{rivals_workshop_assistant.warning_handling.desync.ObjectVarSetInDrawScript.get_warning_text()}",
             f"twice! ",
         ),
+        pytest.param(
+            f"a = 3{rivals_workshop_assistant.warning_handling.desync.ObjectVarSetInDrawScript.get_warning_text()}\nb = 4",
+            "a = 3\nb = 4",
+        ),
     ],
 )
 def test__remove_warnings(original, expected):
     actual = _remove_warnings(original)
     assert actual == expected
+
+
+def test_apply_warnings_to_script__matches_applying_each_warning():
+    hitpause = rivals_workshop_assistant.warning_handling.hitpause
+    desync = rivals_workshop_assistant.warning_handling.desync
+    warning_types = {
+        hitpause.CheckWindowTimerEqualsWithoutCheckHitpause(),
+        hitpause.CheckWindowTimerModuloWithoutCheckHitpause(),
+        desync.UnsafeCameraReadX(),
+        desync.UnsafeCameraReadY(),
+    }
+    original_content = "\n".join(
+        [
+            "if window_timer == 3 {",
+            f"    x = view_get_xview() + view_get_yview(){desync.UnsafeCameraReadX.get_warning_text()}",
+            "    if window_timer % 2 == 0 {} // NO-WARN",
+            "}",
+            "if !hitpause {",
+            "    if window_timer == 3 {}",
+            "}",
+        ]
+    )
+    script = make_script(Path("scripts/attacks/nair.gml"), original_content)
+    expected_script = make_script(Path("scripts/attacks/nair.gml"), original_content)
+
+    _apply_warnings_to_script(script, warning_types)
+
+    expected_script.working_content = _remove_warnings(original_content)
+    for warning_type in sorted(warning_types, key=lambda type_: type(type_).__name__):
+        warning_type.apply(expected_script)
+    assert script.working_content == expected_script.working_content
+    assert script.working_content.count("// WARN: ") == 3
+
+
+def test_apply_warnings_to_script__reuses_cached_detections(monkeypatch):
+    hitpause = rivals_workshop_assistant.warning_handling.hitpause
+    warning_types = {
+        hitpause.CheckWindowTimerEqualsWithoutCheckHitpause(),
+        hitpause.CheckWindowTimerModuloWithoutCheckHitpause(),
+    }
+    path = Path("scripts/attacks/nair.gml")
+    original_content = "if window_timer == 3 {}\nif window_timer % 2 == 0 {}"
+    warning_cache = WarningResultCache()
+    script = make_script(path, original_content)
+    _apply_warnings_to_script(script, warning_types, warning_cache)
+    first_content = script.working_content
+
+    def fail_to_check(self, script):
+        raise AssertionError("Detected warnings again")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(WarningType, "get_line_checker", fail_to_check)
+        rerun_script = make_script(path, first_content)
+        _apply_warnings_to_script(rerun_script, warning_types, warning_cache)
+    assert rerun_script.working_content == first_content
+    assert first_content.count("// WARN: ") == 2
+
+    fewer_types = {hitpause.CheckWindowTimerEqualsWithoutCheckHitpause()}
+    fewer_types_script = make_script(path, first_content)
+    _apply_warnings_to_script(fewer_types_script, fewer_types, warning_cache)
+    assert fewer_types_script.working_content.count("// WARN: ") == 1
+
+    changed_script = make_script(path, "if window_timer == 3 {}")
+    _apply_warnings_to_script(changed_script, warning_types, warning_cache)
+    assert changed_script.working_content.count("// WARN: ") == 1
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        pytest.param("a = 3"),
+        pytest.param("  ab += 3"),
+        pytest.param("b == 3"),
+        pytest.param("variable = 3"),
+        pytest.param("var c = 3"),
+        pytest.param("c = 3"),
+        pytest.param("cd -= 1"),
+        pytest.param("d = "),
+        pytest.param("x.y = 3"),
+        pytest.param("if a = 3"),
+    ],
+)
+def test_object_var_set_in_draw_script__should_warn_for_line(line):
+    local_vars = ["a", "c"]
+    pattern = (
+        rf'^\s*(?!(?:{"|".join(["var"] + local_vars)}))\w+\s*(=|\+=|-=|\*=|\/=)\s*\S'
+    )
+    expected = re.search(pattern=pattern, string=line) is not None
+
+    actual = rivals_workshop_assistant.warning_handling.desync.ObjectVarSetInDrawScript()._should_warn_for_line(
+        local_vars={"var", *local_vars}, line=line
+    )
+
+    assert actual == expected
+
+
+def test_object_var_set_in_draw_script__no_patterns_built_per_line(monkeypatch):
+    lines = []
+    for i in range(2500):
+        lines.append(f"var local_{i} = {i};")
+        lines.append(f"local_{i} += 1;" if i % 10 else f"object_var_{i} = {i};")
+    script = make_script(Path("scripts/big_draw.gml"), "\n".join(lines))
+
+    def fail_building_pattern(*args, **kwargs):
+        assert False, "a pattern was built while checking lines"
+
+    # Checking lines this way took over a minute when a pattern of every local
+    # var was rebuilt for each line.
+    for function_name in ("compile", "match", "search", "findall", "fullmatch"):
+        monkeypatch.setattr(re, function_name, fail_building_pattern)
+    detection_lines = rivals_workshop_assistant.warning_handling.desync.ObjectVarSetInDrawScript().get_detection_lines(
+        script
+    )
+
+    assert detection_lines == [i * 2 + 1 for i in range(0, 2500, 10)]